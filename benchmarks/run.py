@@ -0,0 +1,272 @@
+"""
+Benchmarks for the hot paths of django-i18nfield.
+
+The benchmarks run offline against an in-memory SQLite database filled with generated
+data. Every benchmark is run for each combination of configured languages and rows::
+
+    python benchmarks/run.py --languages 3 30 --rows 100 1000 --output results.json
+
+To check for regressions, compare against the results of an earlier run. The script
+exits with a non-zero status if any benchmark got slower than the given tolerance::
+
+    python benchmarks/run.py --compare results.json --tolerance 0.2
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import django  # NOQA
+from django.conf import settings  # NOQA
+
+settings.configure(
+    INSTALLED_APPS=['django.contrib.contenttypes', 'django.contrib.auth', 'tests.testapp'],
+    DATABASES={'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': ':memory:'}},
+    LANGUAGE_CODE='en',
+    USE_I18N=True,
+    DEFAULT_AUTO_FIELD='django.db.models.AutoField',
+)
+django.setup()
+
+from django import forms  # NOQA
+from django.db import connection  # NOQA
+from django.test.utils import override_settings  # NOQA
+from django.utils import translation  # NOQA
+
+import i18nfield  # NOQA
+from i18nfield.forms import I18nForm, I18nFormField, I18nTextInput  # NOQA
+from i18nfield.rest_framework import I18nField, I18nRestFrameworkEncoder  # NOQA
+from i18nfield.strings import LazyI18nString  # NOQA
+from i18nfield.utils import I18nJSONEncoder  # NOQA
+from tests.testapp.models import Author, Book  # NOQA
+
+BENCHMARKS = []
+
+
+def benchmark(func):
+    BENCHMARKS.append(func)
+    return func
+
+
+def make_languages(count):
+    codes = ['en', 'de', 'fr', 'de-informal', 'es', 'it', 'nl', 'pt-br', 'pt-pt', 'da']
+    codes += ['x%02d' % i for i in range(count - len(codes))]
+    return [(code, 'Language %s' % code) for code in codes[:count]]
+
+
+def make_data(languages, i):
+    # Leave some translations empty to exercise the fallbacks
+    return {code: 'Value %d in %s' % (i, code) for j, (code, name) in enumerate(languages) if (i + j) % 4}
+
+
+class Context:
+
+    def __init__(self, languages, rows):
+        self.languages = languages
+        self.rows = rows
+        self.dicts = [make_data(languages, i) for i in range(rows)]
+        self.raw = [json.dumps(d, sort_keys=True) for d in self.dicts]
+
+
+@benchmark
+def strings_init(ctx):
+    raw = ctx.raw
+    return lambda: [LazyI18nString(r).data for r in raw]
+
+
+@benchmark
+def strings_localize(ctx):
+    values = [LazyI18nString(d) for d in ctx.dicts]
+    return lambda: [v.localize('de-informal') for v in values]
+
+
+@benchmark
+def strings_str(ctx):
+    values = [LazyI18nString(d) for d in ctx.dicts]
+
+    def run():
+        with translation.override('fr'):
+            return [str(v) for v in values]
+    return run
+
+
+@benchmark
+def from_db_value(ctx):
+    return lambda: [str(b.title) for b in Book.objects.all()]
+
+
+@benchmark
+def get_prep_value(ctx):
+    field = Book._meta.get_field('title')
+    values = [LazyI18nString(d) for d in ctx.dicts]
+    return lambda: [field.get_prep_value(v) for v in values]
+
+
+@benchmark
+def bulk_save(ctx):
+    author = Author.objects.first()
+    values = [LazyI18nString(d) for d in ctx.dicts]
+
+    def run():
+        Book.objects.bulk_create([Book(author=author, title=v, abstract=v) for v in values])
+        Book.objects.filter(pk__gt=ctx.rows).delete()
+    return run
+
+
+@benchmark
+def widget_render(ctx):
+    field = I18nFormField(widget=I18nTextInput, required=False)
+    values = [LazyI18nString(d) for d in ctx.dicts[:100]]
+    return lambda: [field.widget.render('title', v, attrs={'id': 'id_title'}) for v in values]
+
+
+@benchmark
+def widget_render_fast(ctx):
+    field = I18nFormField(widget=I18nTextInput, required=False, widget_kwargs={'fast_render': True})
+    values = [LazyI18nString(d) for d in ctx.dicts[:100]]
+    return lambda: [field.widget.render('title', v, attrs={'id': 'id_title'}) for v in values]
+
+
+@benchmark
+def widget_decompress(ctx):
+    field = I18nFormField(widget=I18nTextInput, required=False)
+    values = [LazyI18nString(d) for d in ctx.dicts]
+    return lambda: [field.widget.decompress(v) for v in values]
+
+
+@benchmark
+def formset_clean(ctx):
+    class BookForm(I18nForm):
+        title = I18nFormField(widget=I18nTextInput)
+
+    formset_class = forms.formset_factory(BookForm, extra=0)
+    forms_count = min(ctx.rows, 200)
+    data = {'form-TOTAL_FORMS': str(forms_count), 'form-INITIAL_FORMS': '0'}
+    for i in range(forms_count):
+        for j, (code, name) in enumerate(ctx.languages):
+            data['form-%d-title_%d' % (i, j)] = ctx.dicts[i].get(code, '')
+
+    def run():
+        formset = formset_class(data)
+        assert formset.is_valid()
+    return run
+
+
+@benchmark
+def rest_framework_field(ctx):
+    field = I18nField()
+    values = [LazyI18nString(d) for d in ctx.dicts]
+    return lambda: [field.to_internal_value(field.to_representation(v)) for v in values]
+
+
+@benchmark
+def json_encoder(ctx):
+    return lambda: json.dumps([b.title for b in Book.objects.all()], cls=I18nJSONEncoder)
+
+
+@benchmark
+def rest_framework_encoder(ctx):
+    return lambda: json.dumps([b.title for b in Book.objects.all()], cls=I18nRestFrameworkEncoder)
+
+
+def setup_database(ctx):
+    with connection.schema_editor() as editor:
+        editor.create_model(Author)
+        editor.create_model(Book)
+    author = Author.objects.create(name='Tolkien')
+    Book.objects.bulk_create([Book(author=author, title=r, abstract=r) for r in ctx.raw])
+
+
+def teardown_database():
+    with connection.schema_editor() as editor:
+        editor.delete_model(Book)
+        editor.delete_model(Author)
+
+
+def run(languages_counts, rows_counts, names, repeat):
+    results = []
+    for languages_count in languages_counts:
+        languages = make_languages(languages_count)
+        for rows in rows_counts:
+            ctx = Context(languages, rows)
+            with override_settings(LANGUAGES=languages):
+                setup_database(ctx)
+                try:
+                    for bench in BENCHMARKS:
+                        if names and bench.__name__ not in names:
+                            continue
+                        func = bench(ctx)
+                        timer = timeit.Timer(func)
+                        number, _ = timer.autorange()
+                        timings = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+                        results.append({
+                            'name': bench.__name__,
+                            'languages': languages_count,
+                            'rows': rows,
+                            'best': min(timings),
+                            'mean': sum(timings) / len(timings),
+                        })
+                        print('{name:<24} languages={languages:<4} rows={rows:<6} best={best:.6f}s'.format(**results[-1]))
+                finally:
+                    teardown_database()
+    return results
+
+
+def compare(results, baseline, tolerance):
+    previous = {(r['name'], r['languages'], r['rows']): r for r in baseline['results']}
+    regressions = 0
+    for result in results:
+        old = previous.get((result['name'], result['languages'], result['rows']))
+        if not old:
+            continue
+        ratio = result['best'] / old['best']
+        marker = ''
+        if ratio > 1 + tolerance:
+            marker = '  REGRESSION'
+            regressions += 1
+        print('{:<24} languages={:<4} rows={:<6} {:.2f}x{}'.format(
+            result['name'], result['languages'], result['rows'], ratio, marker
+        ))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the django-i18nfield benchmarks.')
+    parser.add_argument('--languages', type=int, nargs='+', default=[3, 30],
+                        help='Numbers of configured languages to run the benchmarks with.')
+    parser.add_argument('--rows', type=int, nargs='+', default=[100, 1000],
+                        help='Numbers of values/database rows to run the benchmarks with.')
+    parser.add_argument('--repeat', type=int, default=5, help='Number of repetitions per benchmark.')
+    parser.add_argument('--output', help='File to store the results in as JSON.')
+    parser.add_argument('--compare', help='Results of an earlier run to compare with.')
+    parser.add_argument('--tolerance', type=float, default=0.1,
+                        help='Relative slowdown that is reported as a regression.')
+    parser.add_argument('benchmarks', nargs='*', help='Names of the benchmarks to run. Defaults to all.')
+    args = parser.parse_args()
+
+    results = run(args.languages, args.rows, args.benchmarks, args.repeat)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                'meta': {
+                    'i18nfield': i18nfield.version,
+                    'django': django.get_version(),
+                    'python': platform.python_version(),
+                    'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                },
+                'results': results,
+            }, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,346 @@
+import json
+import re
+from django.core.exceptions import FieldError
+from django.db import NotSupportedError
+from django.db.models import F, Func, JSONField, TextField, Value
+from django.db.models.functions import Coalesce, NullIf
+
+from .languages import get_languages
+from .strings import _fallback_chain
+
+
+_SAFE_CODE = re.compile(r'[\w@.-]+', re.ASCII)
+
+
+def _literal(lng: str, value: str):
+    # Language codes are embedded into the SQL directly if they are safe to use, so the
+    # generated SQL is identical to the definition of expression indexes on the same key.
+    if _SAFE_CODE.fullmatch(lng):
+        return "'%s'" % value, ()
+    return '%s', (value,)
+
+
+def _key_sql(lng: str):
+    return _literal(lng, lng)
+
+
+def _path_sql(lng: str):
+    return _literal(lng, '$.%s' % json.dumps(lng))
+
+
+def _is_json_column(expression) -> bool:
+    try:
+        return isinstance(expression.output_field, JSONField)
+    except FieldError:
+        return False
+
+
+class I18nKey(Func):
+    """
+    Extracts the translation for exactly one language from an internationalized
+    field, without applying any fallbacks. This evaluates to ``NULL`` if no translation
+    is stored for the language or if the stored value is not a dictionary of translations.
+
+    :param expression: A field name or an expression referring to an ``I18nCharField``
+                       or ``I18nTextField``.
+    :param lng: A locale code, e.g. ``de``.
+    """
+
+    def __init__(self, expression, lng: str, **extra):
+        self.lng = lng
+        extra.setdefault('output_field', TextField())
+        super().__init__(expression, **extra)
+
+    def __repr__(self):
+        return '{}({!r}, {!r})'.format(self.__class__.__name__, self.source_expressions[0], self.lng)
+
+    def as_sql(self, compiler, connection, **extra_context):
+        raise NotSupportedError(
+            'Extracting translations in the database is not supported on {}.'.format(connection.vendor)
+        )
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        sql, params = compiler.compile(self.source_expressions[0])
+        path, path_params = _path_sql(self.lng)
+        if _is_json_column(self.source_expressions[0]):
+            return 'json_extract(' + sql + ', ' + path + ')', (*params, *path_params)
+        return (
+            '(CASE WHEN json_valid(' + sql + ') THEN json_extract(' + sql + ', ' + path + ') END)',
+            (*params, *params, *path_params)
+        )
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        sql, params = compiler.compile(self.source_expressions[0])
+        key, key_params = _key_sql(self.lng)
+        if _is_json_column(self.source_expressions[0]):
+            return '(' + sql + ' ->> ' + key + ')', (*params, *key_params)
+        return (
+            "(CASE WHEN left(" + sql + ", 1) = '{' THEN (" + sql + ")::jsonb ->> " + key + " END)",
+            (*params, *params, *key_params)
+        )
+
+    def as_mysql(self, compiler, connection, **extra_context):
+        sql, params = compiler.compile(self.source_expressions[0])
+        path, path_params = _path_sql(self.lng)
+        if _is_json_column(self.source_expressions[0]):
+            return 'JSON_UNQUOTE(JSON_EXTRACT(' + sql + ', ' + path + '))', (*params, *path_params)
+        return (
+            '(CASE WHEN JSON_VALID(' + sql + ') THEN JSON_UNQUOTE(JSON_EXTRACT(' + sql + ', ' + path + ')) END)',
+            (*params, *params, *path_params)
+        )
+
+
+class I18nPlainValue(Func):
+    """
+    Evaluates to the stored value of an internationalized field if it is a plain string,
+    e.g. because it has been written before the field was converted to an ``I18nCharField``,
+    and to ``NULL`` if it is a dictionary of translations.
+    """
+    arity = 1
+    output_field = TextField()
+
+    def as_sql(self, compiler, connection, **extra_context):
+        raise NotSupportedError(
+            'Extracting translations in the database is not supported on {}.'.format(connection.vendor)
+        )
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        sql, params = compiler.compile(self.source_expressions[0])
+        if _is_json_column(self.source_expressions[0]):
+            return (
+                "(CASE WHEN json_type(" + sql + ") = 'text' THEN json_extract(" + sql + ", '$') END)",
+                (*params, *params)
+            )
+        return (
+            "(CASE WHEN json_valid(" + sql + ") THEN (CASE WHEN json_type(" + sql + ") = 'object' THEN NULL ELSE "
+            + sql + " END) ELSE " + sql + " END)",
+            (*params, *params, *params, *params)
+        )
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        sql, params = compiler.compile(self.source_expressions[0])
+        if _is_json_column(self.source_expressions[0]):
+            return (
+                "(CASE WHEN jsonb_typeof(" + sql + ") = 'string' THEN " + sql + " #>> '{}' END)",
+                (*params, *params)
+            )
+        return (
+            "(CASE WHEN left(" + sql + ", 1) = '{' THEN NULL ELSE " + sql + " END)",
+            (*params, *params)
+        )
+
+    def as_mysql(self, compiler, connection, **extra_context):
+        sql, params = compiler.compile(self.source_expressions[0])
+        if _is_json_column(self.source_expressions[0]):
+            return (
+                "(CASE WHEN JSON_TYPE(" + sql + ") = 'STRING' THEN JSON_UNQUOTE(" + sql + ") END)",
+                (*params, *params)
+            )
+        return (
+            "(CASE WHEN JSON_VALID(" + sql + ") THEN (CASE WHEN JSON_TYPE(" + sql + ") = 'OBJECT' THEN NULL ELSE "
+            + sql + " END) ELSE " + sql + " END)",
+            (*params, *params, *params, *params)
+        )
+
+
+def db_fallback_chain(lng: str):
+    """
+    Returns the language codes that are tried in the database when localizing to ``lng``.
+    As the database can not enumerate the keys of a stored value, all languages configured
+    in ``settings.LANGUAGES`` are considered instead, in the same alphabetical order in which
+    they are stored.
+    """
+    languages = get_languages()
+    fallbacks = languages.fallbacks.get(lng)
+    keys = set(languages.codes)
+    keys.add(lng)
+    keys.update(fallbacks if fallbacks is not None else [lng.split('-')[0]])
+    return _fallback_chain(lng, tuple(sorted(keys)), languages.default, fallbacks)
+
+
+def preferred_languages(lng: str):
+    """
+    Returns the part of ``db_fallback_chain`` that is preferred over an arbitrary other
+    translation: The language itself, its base language and its regional variants as well
+    as the system's default language, or the fallbacks configured in ``I18NFIELD_FALLBACKS``.
+    """
+    languages = get_languages()
+    fallbacks = languages.fallbacks.get(lng)
+    if fallbacks is not None:
+        return tuple(code for code in db_fallback_chain(lng) if code == lng or code in fallbacks)
+    firstpart = lng.split('-')[0]
+    return tuple(
+        code for code in db_fallback_chain(lng)
+        if code.split('-')[0] == firstpart or code == languages.default
+    )
+
+
+class Localize(Coalesce):
+    """
+    Evaluates to the translation of an internationalized field in the given language.
+    This uses the same fallbacks as ``LazyI18nString.localize``, but only considers the
+    languages configured in ``settings.LANGUAGES`` when looking for regional variants and
+    any other filled translation. The result can be used in ``annotate``, ``order_by``,
+    ``values`` and ``filter``::
+
+        Book.objects.annotate(title_de=Localize('title', 'de')).order_by('title_de')
+
+    :param expression: A field name or an expression referring to an ``I18nCharField``
+                       or ``I18nTextField``.
+    :param lng: A locale code, e.g. ``de``.
+    """
+
+    def __init__(self, expression, lng: str, **extra):
+        if isinstance(expression, str):
+            expression = F(expression)
+        self.lng = lng
+        expressions = [
+            NullIf(I18nKey(expression, code), Value(''))
+            for code in db_fallback_chain(lng)
+        ]
+        expressions.append(I18nPlainValue(expression))
+        expressions.append(Value(''))
+        extra.setdefault('output_field', TextField())
+        super().__init__(*expressions, **extra)
+
+
+class I18nSetKey(Func):
+    """
+    Evaluates to the value of an internationalized field with the translation for one
+    language replaced, while all other translations are kept. This allows to change a
+    single translation of many rows with one ``UPDATE`` query::
+
+        Book.objects.filter(author=a).update(title=I18nSetKey('title', 'de', 'Der Hobbit'))
+
+    If the stored value is not a dictionary of translations, e.g. a plain string, it is
+    replaced by a dictionary only containing the new translation. Removing a translation
+    keeps such values as they are. Like when saving a ``LazyI18nString``, empty translations
+    are removed instead of being stored.
+
+    :param expression: A field name or an expression referring to an internationalized field.
+    :param lng: A locale code, e.g. ``de``.
+    :param value: The new translation, either a string or an expression like ``F('name')``.
+                  ``None`` removes the translation.
+    """
+
+    def __init__(self, expression, lng: str, value=None, **extra):
+        if isinstance(expression, str):
+            expression = F(expression)
+        self.lng = lng
+        self.remove = value is None or value == ''
+        self.literal = not hasattr(value, 'resolve_expression')
+        expressions = [expression]
+        if not self.remove:
+            expressions.append(Value(value) if self.literal else value)
+        super().__init__(*expressions, **extra)
+
+    def __repr__(self):
+        return '{}({!r}, {!r})'.format(self.__class__.__name__, self.source_expressions[0], self.lng)
+
+    def _resolve_output_field(self):
+        return self.source_expressions[0].output_field
+
+    def _compile(self, compiler, is_object, as_object, empty, set_key, remove_key):
+        # is_object, as_object, set_key and remove_key are callables building the SQL of the
+        # respective part from the SQL of their inputs, each returning a tuple of SQL and params.
+        # empty is the SQL of an empty JSON object.
+        sql, params = compiler.compile(self.source_expressions[0])
+        object_sql, object_params = is_object(sql, params)
+        as_object_sql, as_object_params = as_object(sql, params)
+        # Values that are not dictionaries of translations, e.g. plain strings, are replaced when
+        # setting a translation, but must be kept as they are when removing one
+        remove_sql, remove_params = remove_key(as_object_sql, as_object_params)
+        remove_sql, remove_params = (
+            '(CASE WHEN ' + object_sql + ' THEN ' + remove_sql + ' ELSE ' + sql + ' END)',
+            (*object_params, *remove_params, *params)
+        )
+        if self.remove:
+            return remove_sql, remove_params
+        base_sql, base_params = (
+            'COALESCE(CASE WHEN ' + object_sql + ' THEN ' + as_object_sql + ' END, ' + empty + ')',
+            (*object_params, *as_object_params)
+        )
+        value_sql, value_params = compiler.compile(self.source_expressions[1])
+        set_sql, set_params = set_key(base_sql, base_params, value_sql, value_params)
+        if self.literal:
+            return set_sql, set_params
+        return (
+            "(CASE WHEN COALESCE(" + value_sql + ", '') = '' THEN " + remove_sql + " ELSE " + set_sql + " END)",
+            (*value_params, *remove_params, *set_params)
+        )
+
+    def as_sql(self, compiler, connection, **extra_context):
+        raise NotSupportedError(
+            'Updating translations in the database is not supported on {}.'.format(connection.vendor)
+        )
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        path, path_params = _path_sql(self.lng)
+        return self._compile(
+            compiler,
+            lambda sql, params: (
+                "(CASE WHEN json_valid(" + sql + ") THEN json_type(" + sql + ") = 'object' END)", (*params, *params)
+            ),
+            lambda sql, params: (sql, params),
+            "'{}'",
+            lambda base, params, value, value_params: (
+                'json_set(' + base + ', ' + path + ', ' + value + ')', (*params, *path_params, *value_params)
+            ),
+            lambda base, params: ('json_remove(' + base + ', ' + path + ')', (*params, *path_params)),
+        )
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        key, key_params = _key_sql(self.lng)
+        json_column = _is_json_column(self.source_expressions[0])
+        cast = '' if json_column else '::text'
+        if json_column:
+            def is_object(sql, params):
+                return "jsonb_typeof(" + sql + ") = 'object'", params
+
+            def as_object(sql, params):
+                return sql, params
+        else:
+            def is_object(sql, params):
+                return "left(" + sql + ", 1) = '{'", params
+
+            def as_object(sql, params):
+                return '(' + sql + ')::jsonb', params
+        return self._compile(
+            compiler,
+            is_object,
+            as_object,
+            "'{}'::jsonb",
+            lambda base, params, value, value_params: (
+                'jsonb_set(' + base + ', ARRAY[' + key + '], to_jsonb((' + value + ')::text))' + cast,
+                (*params, *key_params, *value_params)
+            ),
+            lambda base, params: ('(' + base + ' - ' + key + ')' + cast, (*params, *key_params)),
+        )
+
+    def as_mysql(self, compiler, connection, **extra_context):
+        path, path_params = _path_sql(self.lng)
+        return self._compile(
+            compiler,
+            lambda sql, params: (
+                "(CASE WHEN JSON_VALID(" + sql + ") THEN JSON_TYPE(" + sql + ") = 'OBJECT' END)", (*params, *params)
+            ),
+            lambda sql, params: (sql, params),
+            "'{}'",
+            lambda base, params, value, value_params: (
+                'JSON_SET(' + base + ', ' + path + ', ' + value + ')', (*params, *path_params, *value_params)
+            ),
+            lambda base, params: ('JSON_REMOVE(' + base + ', ' + path + ')', (*params, *path_params)),
+        )
+
+
+class I18nRemoveKey(I18nSetKey):
+    """
+    Evaluates to the value of an internationalized field with the translation for one
+    language removed. See ``I18nSetKey``.
+
+    :param expression: A field name or an expression referring to an internationalized field.
+    :param lng: A locale code, e.g. ``de``.
+    """
+
+    def __init__(self, expression, lng: str, **extra):
+        super().__init__(expression, lng, None, **extra)
@@ -1,16 +1,29 @@
 import django
 import json
-from django.conf import settings
 from django.db import models
 
 from .forms import I18nFormField, I18nTextarea, I18nTextInput
-from .strings import LazyI18nString
+from .lookups import HasLanguage, I18nAnyTransform, I18nKeyTransformFactory
+from .strings import LazyI18nString, PartialI18nString
 
 
 class I18nFieldMixin:
     form_class = I18nFormField
     widget = I18nTextInput
 
+    def __init__(self, *args, memoize=False, shared=False, **kwargs):
+        self.memoize = memoize
+        self.shared = shared
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        if self.memoize:
+            kwargs['memoize'] = True
+        if self.shared:
+            kwargs['shared'] = True
+        return name, path, args, kwargs
+
     def to_python(self, value):
         if isinstance(value, LazyI18nString):
             return value
@@ -18,24 +31,43 @@ class I18nFieldMixin:
             return None
         return LazyI18nString(value)
 
+    def _ensure_complete(self, value):
+        if isinstance(value, PartialI18nString):
+            raise ValueError(
+                'The value of {} only contains some of its translations and can not be saved. Reload it '
+                'with refresh_from_db() or exclude it from saving with update_fields.'.format(self.name)
+            )
+
     def get_prep_value(self, value):
+        self._ensure_complete(value)
         if isinstance(value, LazyI18nString):
+            if value.raw is not None:
+                # Unmodified values are written back exactly as they have been loaded
+                return value.raw
             value = value.data
         if isinstance(value, dict):
             return json.dumps({k: v for k, v in value.items() if v}, sort_keys=True)
         if isinstance(value, LazyI18nString.LazyGettextProxy):
-            return json.dumps({lng: value[lng] for lng, lngname in settings.LANGUAGES if value[lng]}, sort_keys=True)
+            return json.dumps(value.to_dict(), sort_keys=True)
         return value
 
-    def get_prep_lookup(self, lookup_type, value):  # NOQA
-        raise TypeError('Lookups on i18n strings are currently not supported.')
+    def get_transform(self, name):
+        # Skip the key transforms of JSONField for the JSON-based variants, our own
+        # key transforms cover both storage types.
+        transform = models.Field.get_transform(self, name)
+        if transform:
+            return transform
+        if name == I18nAnyTransform.lookup_name:
+            return I18nAnyTransform
+        # Every other name is treated as a language code, e.g. title__de__icontains
+        return I18nKeyTransformFactory(name)
 
     if django.VERSION < (2,):
         def from_db_value(self, value, expression, connection, context):
-            return LazyI18nString(value)
+            return LazyI18nString(value, memoize=self.memoize, shared=self.shared)
     else:
         def from_db_value(self, value, expression, connection):
-            return LazyI18nString(value)
+            return LazyI18nString(value, memoize=self.memoize, shared=self.shared)
 
     def value_to_string(self, obj):
         value = self.value_from_object(obj)
@@ -52,6 +84,12 @@ class I18nCharField(I18nFieldMixin, models.TextField):
     A CharField which takes internationalized data. Internally, a TextField dabase
     field is used to store JSON. If you interact with this field, you will work
     with LazyI18nString instances.
+
+    :param memoize: If set, values loaded from the database remember their localized
+                    strings, which speeds up rendering the same value multiple times.
+    :param shared: If set, values loaded from the database share their parsed data with
+                   all other values with identical content. Use this for columns with
+                   many repeated values, e.g. category names.
     """
     widget = I18nTextInput
 
@@ -61,3 +99,58 @@ class I18nTextField(I18nFieldMixin, models.TextField):
     Like I18nCharField, but for TextFields.
     """
     widget = I18nTextarea
+
+
+class I18nJSONFieldMixin(I18nFieldMixin):
+    """
+    Variant of ``I18nFieldMixin`` for fields that store their data in a native JSON
+    column instead of a text column. Plain strings are stored as JSON strings.
+    """
+
+    def get_prep_value(self, value):
+        self._ensure_complete(value)
+        if isinstance(value, str):
+            value = LazyI18nString(value)
+        if isinstance(value, LazyI18nString):
+            if value.raw_json() is not None:
+                return value.raw_json()
+            value = value.data
+        if value is None or isinstance(value, (dict, LazyI18nString.LazyGettextProxy)):
+            return super().get_prep_value(value)
+        return json.dumps(value)
+
+    def get_db_prep_value(self, value, connection, prepared=False):
+        # get_prep_value already returns serialized JSON, which must not be encoded again
+        if not prepared:
+            value = self.get_prep_value(value)
+        return value
+
+    def validate(self, value, model_instance):
+        models.Field.validate(self, value, model_instance)
+
+    def formfield(self, **kwargs):
+        defaults = {'form_class': self.form_class, 'widget': self.widget}
+        defaults.update(kwargs)
+        return models.Field.formfield(self, **defaults)
+
+
+class I18nJSONCharField(I18nJSONFieldMixin, models.JSONField):
+    """
+    Like I18nCharField, but stores its data in a native JSON database column (``jsonb``
+    on PostgreSQL). This allows the database to index the contained translations.
+    Use ``i18nfield.operations.AlterI18nFieldToJSON`` to convert an existing
+    ``I18nCharField``. Lookups on the field itself, e.g. ``contains``, are those of
+    ``JSONField``, lookups on single languages work the same as for ``I18nCharField``.
+    """
+    widget = I18nTextInput
+
+
+class I18nJSONTextField(I18nJSONFieldMixin, models.JSONField):
+    """
+    Like I18nTextField, but stores its data in a native JSON database column.
+    """
+    widget = I18nTextarea
+
+
+for field_class in (I18nCharField, I18nTextField, I18nJSONCharField, I18nJSONTextField):
+    field_class.register_lookup(HasLanguage)
@@ -1,38 +1,161 @@
-from typing import List, Union
+from typing import List, Optional, Tuple, Union
 
 import copy
+import json
 from django import forms
-from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.forms import (
     BaseForm, BaseInlineFormSet, BaseModelForm, BaseModelFormSet,
 )
 from django.forms.forms import DeclarativeFieldsMetaclass
 from django.forms.models import ModelFormMetaclass
-from django.utils.html import escape
+from django.utils.html import conditional_escape, escape
 from django.utils.safestring import mark_safe
+from functools import lru_cache
 
+from .languages import LanguageRegistry, get_languages
 from .strings import LazyI18nString
 
 
+def _render_attrs(attrs) -> str:
+    return ''.join(
+        ' %s' % conditional_escape(name) if value is True else ' %s="%s"' % (conditional_escape(name), conditional_escape(value))
+        for name, value in attrs.items() if value is not False
+    )
+
+
+def _fast_render(widget: forms.Widget, name: str, value, attrs) -> Optional[str]:
+    """
+    Renders a ``TextInput`` or ``Textarea`` to the same HTML as Django's built-in templates,
+    without going through the template engine. Returns ``None`` for all other widgets.
+    """
+    widget_type = type(widget)
+    if widget_type is forms.TextInput:
+        value = widget.format_value(value)
+        return '<input type="%s" name="%s"%s%s>' % (
+            conditional_escape(widget.input_type),
+            conditional_escape(name),
+            ' value="%s"' % conditional_escape(value) if value is not None else '',
+            _render_attrs(widget.build_attrs(widget.attrs, attrs)),
+        )
+    if widget_type is forms.Textarea:
+        value = widget.format_value(value)
+        return '<textarea name="%s"%s>\n%s</textarea>' % (
+            conditional_escape(name),
+            _render_attrs(widget.build_attrs(widget.attrs, attrs)),
+            conditional_escape(value) if value else '',
+        )
+    return None
+
+
+@lru_cache(maxsize=128)
+def _locale_info(locales: Tuple[str, ...], languages: LanguageRegistry):
+    """
+    Returns the human-readable names of the given locales and, for every locale, the other
+    locales whose translation is shown if the locale itself has none and they are not enabled.
+    """
+    names = tuple(languages.names.get(locale, locale) for locale in locales)
+    groups = {}
+    for locale in locales:
+        groups.setdefault(locale.split('-')[0], []).append(locale)
+    similar = tuple(
+        languages.fallbacks[locale] if locale in languages.fallbacks
+        else tuple(loc for loc in groups[locale.split('-')[0]] if loc != locale)
+        for locale in locales
+    )
+    return names, similar
+
+
 class I18nWidget(forms.MultiWidget):
     """
     The default form widget for I18nCharField and I18nTextField. It makes
     use of Django's MultiWidget mechanism and does some magic to save you
     time.
+
+    :param fast_render: If set, the sub-widgets are rendered from string templates
+                        instead of Django's template engine, if they are plain text inputs
+                        or text areas. The HTML is the same as the one of Django's built-in
+                        templates, but overridden widget templates and custom form renderers
+                        are ignored. Defaults to the ``fast_render`` attribute of the class.
     """
     widget = forms.TextInput
+    fast_render = False
 
-    def __init__(self, locales: List[str], field: forms.Field, attrs=None):
-        widgets = []
+    def __init__(self, locales: List[str], field: forms.Field, attrs=None, fast_render: Optional[bool] = None):
+        if fast_render is not None:
+            self.fast_render = fast_render
         self.locales = locales
         self.enabled_locales = locales
         self.field = field
-        for lng in self.locales:
-            a = copy.copy(attrs) or {}
-            a['lang'] = lng
-            widgets.append(self.widget(attrs=a))
-        super().__init__(widgets, attrs)
+        # The sub-widgets are only created once they are used, which usually only
+        # happens for the enabled locales
+        self._widgets = {}
+        self._widget_attrs = attrs
+        forms.Widget.__init__(self, attrs)
+
+    def _widget(self, i: int) -> forms.Widget:
+        try:
+            return self._widgets[i]
+        except KeyError:
+            a = copy.copy(self._widget_attrs) or {}
+            a['lang'] = self.locales[i]
+            widget = self._widgets[i] = self.widget(attrs=a)
+            return widget
+
+    @property
+    def widgets(self) -> List[forms.Widget]:
+        return [self._widget(i) for i in range(len(self.locales))]
+
+    @widgets.setter
+    def widgets(self, widgets):
+        self._widgets = dict(enumerate(widgets))
+
+    @property
+    def widgets_names(self) -> List[str]:
+        return ['_%s' % i for i in range(len(self.locales))]
+
+    def _reads_plain_data(self) -> bool:
+        # Most widgets read exactly one key from the submitted data, which can be done
+        # without creating the sub-widgets of the hidden locales
+        return (
+            self.widget.value_from_datadict is forms.Widget.value_from_datadict
+            and self.widget.value_omitted_from_data is forms.Widget.value_omitted_from_data
+        )
+
+    def value_from_datadict(self, data, files, name):
+        if self._reads_plain_data():
+            return [data.get('%s_%s' % (name, i)) for i in range(len(self.locales))]
+        return super().value_from_datadict(data, files, name)
+
+    def value_omitted_from_data(self, data, files, name):
+        if self._reads_plain_data():
+            return all('%s_%s' % (name, i) not in data for i in range(len(self.locales)))
+        return super().value_omitted_from_data(data, files, name)
+
+    @property
+    def is_hidden(self):
+        # All sub-widgets are of the same type
+        return not self.locales or self._widget(0).is_hidden
+
+    @property
+    def needs_multipart_form(self):
+        return bool(self.locales) and self._widget(0).needs_multipart_form
+
+    def _get_media(self):
+        return self._widget(0).media if self.locales else forms.Media()
+    media = property(_get_media)
+
+    def __deepcopy__(self, memo):
+        # Django copies the widget for every form instance. The locales and the attributes
+        # of the sub-widgets to create are shared, only state that might be changed per
+        # form instance is copied.
+        obj = copy.copy(self)
+        memo[id(self)] = obj
+        obj.attrs = self.attrs.copy()
+        obj.enabled_locales = list(self.enabled_locales)
+        obj.field = memo.get(id(self.field), self.field)
+        obj._widgets = {i: w.__deepcopy__(memo) for i, w in self._widgets.items()}
+        return obj
 
     def decompress(self, value) -> List[Union[str, None]]:
         data = []
@@ -40,30 +163,38 @@ class I18nWidget(forms.MultiWidget):
         any_enabled_filled = False
         if not isinstance(value, LazyI18nString):
             value = LazyI18nString(value)
+        value_data = value.get_data()
+        translations = value_data if isinstance(value_data, (dict, LazyI18nString.LazyGettextProxy)) else None
+        enabled = set(self.enabled_locales)
         for i, lng in enumerate(self.locales):
-            dataline = (
-                value.data[lng]
-                if value is not None and (
-                    isinstance(value.data, dict) or isinstance(value.data, LazyI18nString.LazyGettextProxy)
-                ) and lng in value.data
-                else None
-            )
-            if lng in self.enabled_locales:
+            dataline = translations[lng] if translations is not None and lng in translations else None
+            if lng in enabled:
                 if not first_enabled:
                     first_enabled = i
                 if dataline:
                     any_enabled_filled = True
             data.append(dataline)
-        if value and not isinstance(value.data, dict) and not isinstance(value.data, LazyI18nString.LazyGettextProxy):
-            data[first_enabled] = value.data
+        if value and translations is None:
+            data[first_enabled] = value_data
         elif value and not any_enabled_filled:
             data[first_enabled] = value.localize(self.enabled_locales[0])
         return data
 
+    def subwidget_name(self, name: str, i: int) -> str:
+        """
+        Returns the name of the input of the ``i``-th locale.
+        """
+        return '%s_%s' % (name, i)
+
     def render(self, name: str, value, attrs=None, renderer=None) -> str:
-        if self.is_localized:
-            for widget in self.widgets:
-                widget.is_localized = self.is_localized
+        output, id_, values = self._render_subwidgets(name, value, attrs, renderer)
+        return mark_safe(self.format_output(output, id_))
+
+    def _render_subwidgets(self, name: str, value, attrs, renderer):
+        """
+        Renders the sub-widgets of all enabled locales. Returns the rendered sub-widgets,
+        the ID of the widget and a list of the locales and values that have been rendered.
+        """
         # value is a list of values, each corresponding to a widget
         # in self.widgets.
 
@@ -72,39 +203,46 @@ class I18nWidget(forms.MultiWidget):
         if not isinstance(value, list):
             value = self.decompress(value)
         output = []
+        values = []
         final_attrs = self.build_attrs(attrs or dict())
         id_ = final_attrs.get('id', None)
-        for i, widget in enumerate(self.widgets):
-            if self.locales[i] not in self.enabled_locales:
+        names, similar_locales = _locale_info(tuple(self.locales), get_languages())
+        enabled = set(self.enabled_locales)
+        original_data = None
+        if isinstance(original_value, LazyI18nString) and isinstance(original_value.get_data(), dict):
+            original_data = original_value.get_data()
+        for i, locale in enumerate(self.locales):
+            if locale not in enabled:
                 continue
+            widget = self._widget(i)
+            if self.is_localized:
+                widget.is_localized = self.is_localized
             try:
                 widget_value = value[i]
             except IndexError:
                 widget_value = None
 
-            if not widget_value and isinstance(original_value, LazyI18nString) and isinstance(original_value.data, dict):
-                locale = self.locales[i]
-                firstpart = locale.split('-')[0]
-
-                if not widget_value:
-                    similar = [
-                        loc for loc in self.locales
-                        if (loc.startswith(firstpart + "-") or firstpart == loc) and loc != locale
-                    ]
-                    for s in similar:
-                        if original_value.data.get(s) and s not in self.enabled_locales:
-                            widget_value = original_value.data.get(s)
-                            break
+            if not widget_value and original_data is not None:
+                for s in similar_locales[i]:
+                    if original_data.get(s) and s not in enabled:
+                        widget_value = original_data.get(s)
+                        break
 
             final_attrs_widget = final_attrs.copy()
             if id_:
-                human_locale_name = dict(settings.LANGUAGES).get(self.locales[i], self.locales[i])
                 final_attrs_widget['id'] = '%s_%s' % (id_, i)
-                final_attrs_widget['title'] = human_locale_name
+                final_attrs_widget['title'] = names[i]
                 # still allow forms to override the placeholder
-                final_attrs_widget.setdefault('placeholder', human_locale_name)
-            output.append(widget.render(name + '_%s' % i, widget_value, final_attrs_widget, renderer=renderer))
-        return mark_safe(self.format_output(output, id_))
+                final_attrs_widget.setdefault('placeholder', names[i])
+            widget_name = self.subwidget_name(name, i)
+            rendered = None
+            if self.fast_render:
+                rendered = _fast_render(widget, widget_name, widget_value, final_attrs_widget)
+            if rendered is None:
+                rendered = widget.render(widget_name, widget_value, final_attrs_widget, renderer=renderer)
+            output.append(rendered)
+            values.append((locale, widget_value))
+        return output, id_, values
 
     def format_output(self, rendered_widgets, id_) -> str:
         return '<div class="i18n-form-group%s" id="%s">%s</div>' % (
@@ -130,6 +268,62 @@ class I18nTextarea(I18nWidget):
     widget = forms.Textarea
 
 
+class I18nJSONWidgetMixin:
+    """
+    Turns an ``I18nWidget`` into a widget that submits all translations as one JSON-encoded
+    value instead of one value per locale, which keeps the number of submitted fields low on
+    pages with many internationalized fields. The inputs of the single locales are rendered
+    without a name and a script keeps a hidden input with the JSON data up to date. Make sure
+    to include the ``media`` of the form in your page.
+    """
+
+    class Media:
+        js = ('i18nfield/i18nfield-json.js',)
+
+    def subwidget_name(self, name: str, i: int) -> str:
+        # Inputs without a name are not submitted by the browser
+        return ''
+
+    def render(self, name: str, value, attrs=None, renderer=None) -> str:
+        output, id_, values = self._render_subwidgets(name, value, attrs, renderer)
+        payload = json.dumps({locale: '' if v is None else str(v) for locale, v in values}, sort_keys=True)
+        return mark_safe('%s<input type="hidden" name="%s" value="%s" data-i18n-json>' % (
+            self.format_output(output, id_),
+            conditional_escape(name),
+            conditional_escape(payload),
+        ))
+
+    def value_from_datadict(self, data, files, name):
+        try:
+            payload = json.loads(data.get(name) or '{}')
+        except ValueError:
+            payload = {}
+        if not isinstance(payload, dict):
+            payload = {}
+        values = []
+        for locale in self.locales:
+            v = payload.get(locale)
+            values.append(v if isinstance(v, str) else None)
+        return values
+
+    def value_omitted_from_data(self, data, files, name):
+        return name not in data
+
+
+class I18nJSONTextInput(I18nJSONWidgetMixin, I18nTextInput):
+    """
+    Like ``I18nTextInput``, but submits all translations as one JSON value.
+    """
+    pass
+
+
+class I18nJSONTextarea(I18nJSONWidgetMixin, I18nTextarea):
+    """
+    Like ``I18nTextarea``, but submits all translations as one JSON value.
+    """
+    pass
+
+
 class I18nFormField(forms.MultiValueField):
     """
     The form field that is used by I18nCharField and I18nTextField. It makes use
@@ -162,14 +356,15 @@ class I18nFormField(forms.MultiValueField):
         found_all = True
         clean_data = []
         errors = []
-        for i, field in enumerate(self.fields):
+        for i, locale in enumerate(self.locales):
+            field = self._subfield(i)
             try:
                 field_value = value[i]
             except (IndexError, TypeError):
                 field_value = None
             if field_value not in self.empty_values:
                 found = True
-            elif field.locale in self.widget.enabled_locales:
+            elif locale in self.widget.enabled_locales:
                 found_all = False
             try:
                 clean_data.append(field.clean(field_value))
@@ -191,12 +386,10 @@ class I18nFormField(forms.MultiValueField):
         return out
 
     def __init__(self, *args, **kwargs):
-        fields = []
         defaults = {
-            'widget': self.widget,
             'max_length': kwargs.pop('max_length', None),
         }
-        self.locales = kwargs.pop('locales', [loc[0] for loc in settings.LANGUAGES])
+        self.locales = kwargs.pop('locales', list(get_languages().codes))
         self.one_required = kwargs.get('required', True)
         require_all_fields = kwargs.pop('require_all_fields', False)
         kwargs['required'] = False
@@ -204,16 +397,52 @@ class I18nFormField(forms.MultiValueField):
             locales=self.locales, field=self, **kwargs.pop('widget_kwargs', {})
         )
         defaults.update(**kwargs)
-        for lngcode in self.locales:
-            defaults['label'] = '%s (%s)' % (defaults.get('label'), lngcode)
-            field = forms.CharField(**defaults)
-            field.locale = lngcode
-            fields.append(field)
+        # The sub-fields are never rendered, the widget renders its own sub-widgets
+        del defaults['widget']
+        self._subfield_label = defaults.pop('label', None)
+        self._subfield_defaults = defaults
         super().__init__(
-            fields=fields, require_all_fields=False, *args, **kwargs
+            fields=(), require_all_fields=False, *args, **kwargs
         )
+        # All sub-fields only differ in their labels, so a single one is used to clean the
+        # values of all locales until the sub-fields for each locale are accessed.
+        self._fields = None
+        self._default_subfield = self._make_subfield(self._subfield_label)
         self.require_all_fields = require_all_fields
 
+    def _make_subfield(self, label) -> forms.CharField:
+        field = forms.CharField(label=label, **self._subfield_defaults)
+        field.error_messages.setdefault('incomplete', self.error_messages['incomplete'])
+        if self.disabled:
+            field.disabled = True
+        return field
+
+    def _subfield(self, i: int) -> forms.CharField:
+        if self._fields is None:
+            return self._default_subfield
+        return self._fields[i]
+
+    @property
+    def fields(self) -> List[forms.CharField]:
+        if self._fields is None:
+            self._fields = []
+            for lngcode in self.locales:
+                field = self._make_subfield('%s (%s)' % (self._subfield_label, lngcode))
+                field.locale = lngcode
+                self._fields.append(field)
+        return self._fields
+
+    @fields.setter
+    def fields(self, fields):
+        self._fields = fields
+
+    def __deepcopy__(self, memo):
+        result = forms.Field.__deepcopy__(self, memo)
+        # The default sub-field is never changed after its creation and can be shared
+        if self._fields is not None:
+            result._fields = [copy.deepcopy(f, memo) for f in self._fields]
+        return result
+
     def has_changed(self, initial, data):
         if self.disabled:
             return False
@@ -222,9 +451,10 @@ class I18nFormField(forms.MultiValueField):
         else:
             if not isinstance(initial, list):
                 initial = self.widget.decompress(initial)
-        for field, initial, data in zip(self.fields, initial, data):
-            if field.locale not in self.widget.enabled_locales:
+        for i, (locale, initial, data) in enumerate(zip(self.locales, initial, data)):
+            if locale not in self.widget.enabled_locales:
                 continue
+            field = self._subfield(i)
             try:
                 initial = field.to_python(initial)
             except ValidationError:
@@ -234,6 +464,32 @@ class I18nFormField(forms.MultiValueField):
         return False
 
 
+class I18nJSONFormField(I18nFormField):
+    """
+    Like ``I18nFormField``, but uses ``I18nJSONTextInput`` by default, so that all translations
+    are submitted as one JSON value. Pass ``widget=I18nJSONTextarea`` for multi-line texts.
+    If the field is created by a model field, e.g. through ``field_classes`` of a model form,
+    the default widget of the model field is replaced by its JSON variant. Besides the list
+    of values per locale, ``clean`` also accepts the JSON value itself.
+    """
+
+    # Model fields pass their default widget class, which is replaced by its JSON variant
+    json_widgets = {
+        I18nTextInput: I18nJSONTextInput,
+        I18nTextarea: I18nJSONTextarea,
+    }
+
+    def __init__(self, *args, **kwargs):
+        widget = kwargs.get('widget') or I18nJSONTextInput
+        kwargs['widget'] = self.json_widgets.get(widget, widget) if isinstance(widget, type) else widget
+        super().__init__(*args, **kwargs)
+
+    def clean(self, value) -> LazyI18nString:
+        if isinstance(value, str):
+            value = self.widget.value_from_datadict({'value': value}, {}, 'value')
+        return super().clean(value)
+
+
 class I18nFormMixin:
     def __init__(self, *args, **kwargs):
         locales = kwargs.pop('locales', None)
@@ -0,0 +1,109 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.db import models
+from django.db.models.functions import Lower
+from django.db.models.sql import Query
+
+from .expressions import I18nKey
+
+try:
+    from django.contrib.postgres.indexes import OpClass
+except ImportError:  # Django < 4.0
+    OpClass = None
+
+
+class I18nLanguageIndexMixin:
+    """
+    Builds the index expressions of ``I18nLanguageIndex`` and ``I18nLanguageGinIndex``.
+    """
+    # MySQL can only index a prefix of the generated LONGTEXT columns
+    mysql_prefix_length = 191
+
+    def __init__(self, *, fields, language: str, name: str, lower: bool = False, opclasses=(), **kwargs):
+        if opclasses and len(opclasses) != len(fields):
+            raise ValueError('I18nLanguageIndex.fields and I18nLanguageIndex.opclasses must have the same number of elements.')
+        if opclasses and OpClass is None:
+            raise ValueError('I18nLanguageIndex.opclasses requires Django 4.0 or newer.')
+        self.i18n_fields = list(fields)
+        self.language = language
+        self.lower = lower
+        self.i18n_opclasses = list(opclasses)
+        expressions = []
+        for i, field_name in enumerate(self.i18n_fields):
+            expression = I18nKey(field_name, language)
+            if lower:
+                expression = Lower(expression)
+            if opclasses:
+                expression = OpClass(expression, name=opclasses[i])
+            expressions.append(expression)
+        super().__init__(*expressions, name=name, **kwargs)
+
+    def deconstruct(self):
+        path, expressions, kwargs = super().deconstruct()
+        kwargs['fields'] = self.i18n_fields
+        kwargs['language'] = self.language
+        if self.lower:
+            kwargs['lower'] = True
+        if self.i18n_opclasses:
+            kwargs['opclasses'] = self.i18n_opclasses
+        return path, (), kwargs
+
+    def _mysql_columns(self):
+        return ['{}_{}'.format(self.name, i) for i in range(len(self.expressions))]
+
+    def create_sql(self, model, schema_editor, using='', **kwargs):
+        if schema_editor.connection.vendor != 'mysql':
+            return super().create_sql(model, schema_editor, using=using, **kwargs)
+
+        # MySQL can not index TEXT expressions, so the translations are stored in virtual
+        # generated columns with a prefix index on top of them. MySQL uses this index for
+        # all queries containing the same expression as the generated column.
+        query = Query(model, alias_cols=False)
+        compiler = query.get_compiler(connection=schema_editor.connection)
+        alterations, index_columns = [], []
+        for column, expression in zip(self._mysql_columns(), self.expressions):
+            sql, params = compiler.compile(expression.resolve_expression(query))
+            sql = sql % tuple(schema_editor.quote_value(p) for p in params)
+            alterations.append(
+                'ADD COLUMN {} LONGTEXT CHARACTER SET utf8mb4 COLLATE utf8mb4_bin GENERATED ALWAYS AS ({}) VIRTUAL'.format(
+                    schema_editor.quote_name(column), sql
+                )
+            )
+            index_columns.append('{}({})'.format(schema_editor.quote_name(column), self.mysql_prefix_length))
+        alterations.append('ADD INDEX {} ({})'.format(schema_editor.quote_name(self.name), ', '.join(index_columns)))
+        return 'ALTER TABLE {} {}'.format(schema_editor.quote_name(model._meta.db_table), ', '.join(alterations))
+
+    def remove_sql(self, model, schema_editor, **kwargs):
+        if schema_editor.connection.vendor != 'mysql':
+            return super().remove_sql(model, schema_editor, **kwargs)
+        alterations = ['DROP INDEX {}'.format(schema_editor.quote_name(self.name))]
+        alterations += ['DROP COLUMN {}'.format(schema_editor.quote_name(c)) for c in self._mysql_columns()]
+        return 'ALTER TABLE {} {}'.format(schema_editor.quote_name(model._meta.db_table), ', '.join(alterations))
+
+
+class I18nLanguageIndex(I18nLanguageIndexMixin, models.Index):
+    """
+    An index on the translation of one or more internationalized fields in one language.
+    It speeds up lookups like ``title__de='…'`` as well as sorting by ``I18nKey('title', 'de')``::
+
+        class Meta:
+            indexes = [
+                I18nLanguageIndex(fields=['title'], language='de', name='book_title_de'),
+            ]
+
+    On SQLite and PostgreSQL, this creates an expression index. On MySQL, it creates a
+    virtual generated column with an index on its first 191 characters.
+
+    :param fields: The names of the internationalized fields to index.
+    :param language: The locale code of the translation to index, e.g. ``de``.
+    :param lower: Index the lower-cased translation, for queries on ``Lower(I18nKey(…))``.
+    :param opclasses: PostgreSQL operator classes to use, one per field. Requires Django 4.0
+                      or newer.
+    """
+
+
+class I18nLanguageGinIndex(I18nLanguageIndexMixin, GinIndex):
+    """
+    Like ``I18nLanguageIndex``, but creates a GIN index and is therefore only available on
+    PostgreSQL. Together with ``opclasses=['gin_trgm_ops']`` and the ``pg_trgm`` extension,
+    this speeds up substring searches like ``title__de__contains``.
+    """
@@ -0,0 +1,68 @@
+from typing import Dict, Iterable, Optional, Tuple
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+
+class LanguageRegistry:
+    """
+    A compiled view of ``settings.LANGUAGES``, ``settings.LANGUAGE_CODE`` and
+    ``settings.I18NFIELD_FALLBACKS``, so that code on hot paths does not need to rebuild lists
+    and dictionaries from the settings on every call. Use ``get_languages`` to get the registry
+    for the current settings.
+    """
+    __slots__ = ('codes', 'names', 'valid', 'default', 'groups', 'siblings', 'fallbacks')
+
+    def __init__(self, languages, default: str, fallbacks: Optional[Dict[str, Iterable[str]]] = None):
+        #: The configured locale codes, in the configured order
+        self.codes: Tuple[str, ...] = tuple(code for code, name in languages)
+        #: Maps locale codes to their (possibly lazy) human-readable names
+        self.names: Dict[str, str] = dict(languages)
+        #: All configured locale codes, for fast membership tests
+        self.valid = frozenset(self.codes)
+        #: The system's default language
+        self.default = default
+        #: Maps base languages, e.g. ``de``, to all configured codes of that language
+        self.groups: Dict[str, Tuple[str, ...]] = {}
+        for code in self.codes:
+            base = code.split('-')[0]
+            self.groups[base] = self.groups.get(base, ()) + (code,)
+        #: Maps every configured code to the other configured codes of the same base language
+        self.siblings: Dict[str, Tuple[str, ...]] = {
+            code: tuple(c for c in self.groups[code.split('-')[0]] if c != code)
+            for code in self.codes
+        }
+        #: Maps locale codes to their explicitly configured fallback languages
+        self.fallbacks: Dict[str, Tuple[str, ...]] = {}
+        for code, chain in (fallbacks or {}).items():
+            if isinstance(chain, str):
+                raise ImproperlyConfigured(
+                    'I18NFIELD_FALLBACKS must map locale codes to lists of locale codes, got {!r} for {}.'.format(chain, code)
+                )
+            self.fallbacks[code] = tuple(chain)
+
+
+_registry: Optional[LanguageRegistry] = None
+
+
+def get_languages() -> LanguageRegistry:
+    """
+    Returns the ``LanguageRegistry`` for the current settings. It is built on first use and
+    rebuilt after the settings have been changed, e.g. with ``override_settings``.
+    """
+    global _registry
+    registry = _registry
+    if registry is None:
+        registry = _registry = LanguageRegistry(
+            settings.LANGUAGES, settings.LANGUAGE_CODE, getattr(settings, 'I18NFIELD_FALLBACKS', None)
+        )
+    return registry
+
+
+@receiver(setting_changed)
+def _setting_changed(setting, **kwargs):
+    global _registry
+    if setting in ('LANGUAGES', 'LANGUAGE_CODE', 'I18NFIELD_FALLBACKS'):
+        _registry = None
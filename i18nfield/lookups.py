@@ -0,0 +1,87 @@
+from django.db.models import Lookup, TextField, Transform
+
+from .expressions import I18nKey
+from .languages import get_languages
+
+
+class I18nKeyTransform(Transform):
+    """
+    Transforms an internationalized field into its translation for one language, e.g.
+    ``title__de__icontains='ring'``. No fallbacks are applied.
+    """
+    output_field = TextField()
+
+    def __init__(self, lng: str, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lng = lng
+
+    def as_sql(self, compiler, connection):
+        return compiler.compile(I18nKey(self.lhs, self.lng))
+
+
+class I18nKeyTransformFactory:
+
+    def __init__(self, lng: str):
+        self.lng = lng
+
+    def __call__(self, *args, **kwargs):
+        return I18nKeyTransform(self.lng, *args, **kwargs)
+
+
+class AnyI18nKeyLookup(Lookup):
+    """
+    Base class for lookups on ``I18nAnyTransform`` that match if the wrapped lookup matches
+    the translation in any of the languages configured in ``settings.LANGUAGES``.
+    """
+    lookup_class = None
+
+    def get_prep_lookup(self):
+        # The value is prepared by the wrapped lookups
+        return self.rhs
+
+    def as_sql(self, compiler, connection):
+        sqls, params = [], []
+        for code in get_languages().codes:
+            sql, lookup_params = compiler.compile(self.lookup_class(I18nKey(self.lhs.lhs, code), self.rhs))
+            sqls.append(sql)
+            params.extend(lookup_params)
+        return '(%s)' % ' OR '.join(sqls), params
+
+
+class I18nAnyTransform(Transform):
+    """
+    Allows to run a lookup on all translations of a field at once, e.g.
+    ``title__any__icontains='ring'``.
+    """
+    lookup_name = 'any'
+    output_field = TextField()
+    _any_lookups = {}
+
+    def get_lookup(self, lookup_name):
+        lookup_class = self.output_field.get_lookup(lookup_name)
+        if lookup_class is None:
+            return None
+        if lookup_class not in self._any_lookups:
+            self._any_lookups[lookup_class] = type(
+                'Any' + lookup_class.__name__, (AnyI18nKeyLookup,),
+                {'lookup_class': lookup_class, 'lookup_name': lookup_class.lookup_name}
+            )
+        return self._any_lookups[lookup_class]
+
+    def as_sql(self, compiler, connection):
+        raise ValueError('The "any" transform of an internationalized field needs to be followed by a lookup.')
+
+
+class HasLanguage(Lookup):
+    """
+    Matches values that contain a non-empty translation for the given language, e.g.
+    ``title__has_lang='fr'``.
+    """
+    lookup_name = 'has_lang'
+    prepare_rhs = False
+
+    def as_sql(self, compiler, connection):
+        if not isinstance(self.rhs, str):
+            raise ValueError('The has_lang lookup expects a language code.')
+        sql, params = compiler.compile(I18nKey(self.lhs, self.rhs))
+        return "COALESCE(%s, '') <> ''" % sql, params
@@ -0,0 +1,121 @@
+import copy
+
+from .fields import I18nFieldMixin
+from .strings import LazyI18nString
+
+_missing = object()
+
+
+class _SavedValue:
+    """
+    The value of an internationalized field as it has been written by ``save()``. Unlike
+    values loaded from the database, it can not tell by itself whether it has been
+    changed since, so a copy of its data is kept for comparison.
+    """
+    __slots__ = ('value', 'data')
+
+    def __init__(self, value):
+        self.value = value
+        self.data = _data_of(value)
+
+
+def _data_of(value):
+    data = value.get_data() if isinstance(value, LazyI18nString) else value
+    return copy.copy(data) if isinstance(data, dict) else data
+
+
+class I18nModelMixin:
+    """
+    A mixin for models with internationalized fields that only writes those internationalized
+    fields to the database in ``save()`` that have actually been changed since the object
+    has been loaded or saved::
+
+        class Book(I18nModelMixin, models.Model):
+            title = I18nCharField()
+
+    This keeps ``UPDATE`` statements small and saves encoding the JSON of unchanged values.
+    It also allows to save objects loaded with ``I18nQuerySet.localized`` as long as their
+    partially loaded fields have not been modified and any other field is written. If no field
+    has been changed at all, the object is saved as usual. Calls to ``save()`` with explicit
+    ``update_fields`` or ``force_insert`` and objects without a primary key, e.g. copies,
+    are not affected. If the row of a changed object has been deleted in the meantime,
+    ``save()`` raises ``DatabaseError`` like Django does for ``update_fields``; pass
+    ``force_insert=True`` to create it again.
+    """
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._i18n_loaded = {}
+        instance._i18n_snapshot()
+        return instance
+
+    def _i18n_snapshot(self, attnames=None):
+        loaded = self.__dict__.get('_i18n_loaded')
+        if loaded is None:
+            return
+        for field in self._meta.concrete_fields:
+            if isinstance(field, I18nFieldMixin) and field.attname in self.__dict__:
+                if attnames is None or field.attname in attnames:
+                    loaded[field.attname] = self.__dict__[field.attname]
+
+    def _i18n_unchanged(self, field) -> bool:
+        value = self.__dict__.get(field.attname)
+        loaded = self.__dict__['_i18n_loaded'].get(field.attname, _missing)
+        if isinstance(loaded, _SavedValue):
+            return value is loaded.value and _data_of(value) == loaded.data
+        if value is not loaded:
+            return False
+        return value is None or not isinstance(value, LazyI18nString) or not value.has_changed()
+
+    def get_i18n_update_fields(self):
+        """
+        Returns the names of the fields that ``save()`` needs to write, i.e. all loaded
+        fields except the internationalized fields that have not been changed. Returns
+        ``None`` if all loaded fields need to be written, no field would be left or the
+        object has not been loaded from the database.
+        """
+        if self.__dict__.get('_i18n_loaded') is None or self._state.adding or self._get_pk_val() is None:
+            return None
+        deferred = self.get_deferred_fields()
+        update_fields = []
+        skipped = False
+        for field in self._meta.concrete_fields:
+            if field.primary_key or field.attname in deferred:
+                continue
+            if isinstance(field, I18nFieldMixin) and self._i18n_unchanged(field):
+                skipped = True
+                continue
+            update_fields.append(field.name)
+        # With empty update_fields, Django would neither send signals nor insert a deleted row
+        return update_fields if skipped and update_fields else None
+
+    def save(self, *args, **kwargs):
+        if not args and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            if kwargs.get('using') in (None, self._state.db):
+                update_fields = self.get_i18n_update_fields()
+                if update_fields is not None:
+                    kwargs['update_fields'] = update_fields
+        super().save(*args, **kwargs)
+        if not args:
+            self._i18n_saved(kwargs.get('update_fields'))
+
+    def _i18n_saved(self, update_fields):
+        # Remember the written values, so that they are not written again by the next save()
+        loaded = self.__dict__.setdefault('_i18n_loaded', {})
+        if update_fields is not None:
+            update_fields = set(update_fields)
+        deferred = self.get_deferred_fields()
+        for field in self._meta.concrete_fields:
+            if not isinstance(field, I18nFieldMixin) or field.attname in deferred:
+                continue
+            if update_fields is None or field.name in update_fields or field.attname in update_fields:
+                if not self._i18n_unchanged(field):
+                    loaded[field.attname] = _SavedValue(self.__dict__.get(field.attname))
+
+    def refresh_from_db(self, using=None, fields=None):
+        super().refresh_from_db(using=using, fields=fields)
+        self.__dict__.setdefault('_i18n_loaded', {})
+        if fields is not None:
+            fields = {self._meta.get_field(name).attname for name in fields}
+        self._i18n_snapshot(fields)
@@ -0,0 +1,44 @@
+from django.db import NotSupportedError, migrations
+
+
+class AlterI18nFieldToJSON(migrations.AlterField):
+    """
+    Migration operation that converts an ``I18nCharField`` or ``I18nTextField`` into an
+    ``I18nJSONCharField`` or ``I18nJSONTextField``, changing the text column into a native
+    JSON column in place. Stored values that are not valid JSON, e.g. plain strings written
+    before the field was internationalized, are converted into JSON strings first::
+
+        operations = [
+            AlterI18nFieldToJSON(
+                model_name='book',
+                name='title',
+                field=i18nfield.fields.I18nJSONCharField(verbose_name='Book title'),
+            ),
+        ]
+
+    Reverting the operation turns the column back into a text column containing JSON.
+    """
+    quote_sql = {
+        'sqlite': 'UPDATE {table} SET {column} = json_quote({column}) '
+                  'WHERE {column} IS NOT NULL AND NOT json_valid({column})',
+        'postgresql': "UPDATE {table} SET {column} = to_jsonb({column})::text "
+                      "WHERE {column} IS NOT NULL AND left({column}, 1) <> '{{'",
+        'mysql': 'UPDATE {table} SET {column} = JSON_QUOTE({column}) '
+                 'WHERE {column} IS NOT NULL AND NOT JSON_VALID({column})',
+    }
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        from_model = from_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, from_model):
+            vendor = schema_editor.connection.vendor
+            if vendor not in self.quote_sql:
+                raise NotSupportedError('Converting i18n fields to JSON is not supported on {}.'.format(vendor))
+            field = from_model._meta.get_field(self.name)
+            schema_editor.execute(self.quote_sql[vendor].format(
+                table=schema_editor.quote_name(from_model._meta.db_table),
+                column=schema_editor.quote_name(field.column),
+            ))
+        super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def describe(self):
+        return 'Convert field %s on %s to JSON' % (self.name, self.model_name)
@@ -0,0 +1,185 @@
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+from django.db import models
+from django.db.models.functions import Coalesce, NullIf
+from django.db.models.query import ModelIterable
+from itertools import islice
+
+from .expressions import (
+    I18nKey, I18nPlainValue, I18nRemoveKey, I18nSetKey, Localize,
+    db_fallback_chain, preferred_languages,
+)
+from .fields import I18nFieldMixin
+from .strings import PartialI18nString, localize_many
+
+
+class LocalizedModelIterable(ModelIterable):
+    """
+    Yields model instances whose internationalized fields have been loaded through
+    ``I18nQuerySet.localized``.
+    """
+
+    def __iter__(self):
+        projection = self.queryset._i18n_projection
+        for obj in super().__iter__():
+            for attname, (columns, rest_column, lng) in projection.items():
+                data = {}
+                for alias, code in columns:
+                    value = obj.__dict__.pop(alias)
+                    if value:
+                        data[code] = value
+                rest = obj.__dict__.pop(rest_column)
+                if rest and not data:
+                    data[lng] = rest
+                obj.__dict__[attname] = PartialI18nString(data)
+            if hasattr(obj, '_i18n_snapshot'):
+                # Unchanged partial values can be skipped by I18nModelMixin.save()
+                obj._i18n_snapshot(projection)
+            yield obj
+
+
+class I18nQuerySet(models.QuerySet):
+    """
+    A ``QuerySet`` with additional methods for models with internationalized fields.
+    Use ``I18nManager`` to make it the default for your model::
+
+        class Book(models.Model):
+            title = I18nCharField()
+
+            objects = I18nManager()
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._i18n_projection = {}
+
+    def _clone(self):
+        c = super()._clone()
+        c._i18n_projection = dict(self._i18n_projection)
+        return c
+
+    def _i18n_fields(self, fields: Optional[Iterable[str]]):
+        if fields is None:
+            return [f for f in self.model._meta.concrete_fields if isinstance(f, I18nFieldMixin)]
+        return [self.model._meta.get_field(name) for name in fields]
+
+    def localized(self, lng: str, fields: Optional[Iterable[str]] = None) -> 'I18nQuerySet':
+        """
+        Only loads the translations that are required to display the internationalized
+        fields in the language ``lng``, instead of all translations. The translations are
+        extracted in the database, which considerably reduces the amount of data that needs
+        to be transferred and parsed if many languages are configured.
+
+        The fields of the returned objects contain ``PartialI18nString`` values, which
+        localize to the same value as the complete string for the language ``lng``, but can
+        not be saved back to the database.
+
+        :param lng: A locale code, e.g. ``de``.
+        :param fields: The names of the fields that should be loaded partially. Defaults to
+                       all internationalized fields of the model.
+        """
+        clone = self._chain()
+        fields = self._i18n_fields(fields)
+        preferred = preferred_languages(lng)
+        annotations = {}
+        for field in fields:
+            prefix = '_i18n_{}_{}'.format(field.attname, lng)
+            columns = []
+            for i, code in enumerate(preferred):
+                alias = '{}_{}'.format(prefix, i)
+                annotations[alias] = I18nKey(field.name, code)
+                columns.append((alias, code))
+            annotations[prefix + '_rest'] = Coalesce(
+                *[NullIf(I18nKey(field.name, code), models.Value('')) for code in db_fallback_chain(lng)
+                  if code not in preferred],
+                I18nPlainValue(field.name),
+                models.Value(''),
+                output_field=models.TextField(),
+            )
+            clone._i18n_projection[field.attname] = (columns, prefix + '_rest', lng)
+        clone = clone.defer(*[field.name for field in fields]).annotate(**annotations)
+        clone._iterable_class = LocalizedModelIterable
+        return clone
+
+    def iter_localized(self, lng: str, fields: Optional[Iterable[str]] = None,
+                       chunk_size: int = 2000) -> Iterator[Tuple[models.Model, Dict[str, str]]]:
+        """
+        Yields tuples of every object and a dictionary mapping the names of its internationalized
+        fields to their values localized to ``lng``. The objects are processed in chunks using
+        ``localize_many``, which is faster than localizing every value on its own::
+
+            for book, strings in Book.objects.localized('de').iter_localized('de'):
+                writer.writerow([book.pk, strings['title']])
+
+        :param lng: A locale code, e.g. ``de``.
+        :param fields: The names of the fields that should be localized. Defaults to all
+                       internationalized fields of the model.
+        :param chunk_size: The number of objects that are localized at once.
+        """
+        fields = self._i18n_fields(fields)
+        objects = iter(self)
+        while True:
+            chunk = list(islice(objects, chunk_size))
+            if not chunk:
+                return
+            columns = [localize_many([getattr(obj, field.attname) for obj in chunk], lng) for field in fields]
+            for i, obj in enumerate(chunk):
+                yield obj, {field.name: column[i] for field, column in zip(fields, columns)}
+
+    def values_localized(self, lng: str, *fields: str, chunk_size: int = 2000) -> Iterator[Dict[str, Any]]:
+        """
+        Streams the given fields of all rows as dictionaries, with internationalized fields
+        already localized to ``lng`` by the database. No model instances or ``LazyI18nString``
+        values are created and the rows are fetched with ``iterator``, so this keeps memory
+        usage constant even for very large exports::
+
+            for row in Book.objects.values_localized('de', 'pk', 'title'):
+                writer.writerow([row['pk'], row['title']])
+
+        The translations are chosen like ``Localize`` does it.
+
+        :param lng: A locale code, e.g. ``de``.
+        :param fields: The fields to return, may include fields that are not internationalized.
+                       Defaults to all internationalized fields of the model.
+        :param chunk_size: The number of rows fetched from the database at once.
+        """
+        i18n_names = {field.name for field in self._i18n_fields(None)}
+        if not fields:
+            fields = [field.name for field in self._i18n_fields(None)]
+        columns = [Localize(name, lng) if name in i18n_names else name for name in fields]
+        for row in self.values_list(*columns).iterator(chunk_size=chunk_size):
+            yield dict(zip(fields, row))
+
+
+class I18nManager(models.Manager.from_queryset(I18nQuerySet)):
+    pass
+
+
+class I18nUpdate:
+    """
+    Changes one translation of an internationalized field for all rows of a queryset with a
+    single ``UPDATE`` query, without loading any objects and while keeping the translations in
+    all other languages::
+
+        I18nUpdate.set_language(Book.objects.filter(author=a), 'title', 'fr', F('original_title'))
+        I18nUpdate.remove_language(Book.objects.all(), 'title', 'de-informal')
+
+    Like ``QuerySet.update``, this does not call ``save()`` or send any signals.
+    """
+
+    @staticmethod
+    def set_language(queryset: models.QuerySet, field: str, lng: str, value) -> int:
+        """
+        Sets the translation of ``field`` in the language ``lng`` to ``value``, which may be
+        a string or an expression like ``F('name')``. Empty values remove the translation.
+        Returns the number of updated rows.
+        """
+        return queryset.update(**{field: I18nSetKey(field, lng, value)})
+
+    @staticmethod
+    def remove_language(queryset: models.QuerySet, field: str, lng: str) -> int:
+        """
+        Removes the translation of ``field`` in the language ``lng``. Returns the number of
+        updated rows.
+        """
+        return queryset.update(**{field: I18nRemoveKey(field, lng)})
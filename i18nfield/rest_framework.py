@@ -1,7 +1,7 @@
-from django.conf import settings
-
-from .fields import I18nCharField, I18nTextField
+from .fields import I18nCharField, I18nJSONCharField, I18nJSONTextField, I18nTextField
+from .languages import get_languages
 from .strings import LazyI18nString
+from .utils import RawI18nJSONMixin
 
 try:
     from rest_framework.exceptions import ValidationError
@@ -13,10 +13,10 @@ except ImportError:
     ValidationError = Field = ModelSerializer = JSONRenderer = JSONEncoder = object
 
 
-class I18nRestFrameworkEncoder(JSONEncoder):
+class I18nRestFrameworkEncoder(RawI18nJSONMixin, JSONEncoder):
     def default(self, obj):
         if isinstance(obj, LazyI18nString):
-            return obj.data
+            return self.encode_i18n(obj)
         else:
             return super().default(obj)
 
@@ -34,20 +34,25 @@ class I18nField(Field):
         super().__init__(**kwargs)
 
     def to_representation(self, value):
-        if hasattr(value, 'data'):
-            if isinstance(value.data, dict):
-                return value.data
-            elif value.data is None:
-                return None
-            else:
-                return {
-                    settings.LANGUAGE_CODE: str(value.data)
-                }
+        if isinstance(value, LazyI18nString):
+            # Unlike data, this does not mark the value as modified
+            data = value.get_data()
+        elif hasattr(value, 'data'):
+            data = value.data
         elif value is None:
             return None
         else:
             return {
-                settings.LANGUAGE_CODE: str(value)
+                get_languages().default: str(value)
+            }
+        if isinstance(data, dict):
+            # The output may be modified by the caller, while the data may be shared with other values
+            return dict(data)
+        elif data is None:
+            return None
+        else:
+            return {
+                get_languages().default: str(data)
             }
 
     def to_internal_value(self, data):
@@ -56,7 +61,7 @@ class I18nField(Field):
         elif isinstance(data, dict):
             if any([not isinstance(v, str) for v in data.values()]):
                 raise ValidationError('All entries must be strings.')
-            if any([k not in dict(settings.LANGUAGES) for k in data.keys()]):
+            if not get_languages().valid.issuperset(data):
                 raise ValidationError('Invalid languages included.')
             return LazyI18nString(data)
         else:
@@ -64,8 +69,15 @@ class I18nField(Field):
 
 
 class I18nAwareModelSerializer(ModelSerializer):
-    pass
+
+    def build_standard_field(self, field_name, model_field):
+        field_class, field_kwargs = super().build_standard_field(field_name, model_field)
+        if issubclass(field_class, I18nField):
+            # Only meant for the JSONField of rest_framework, which is replaced for our JSON-based fields
+            field_kwargs.pop('encoder', None)
+            field_kwargs.pop('decoder', None)
+        return field_class, field_kwargs
 
 
-I18nAwareModelSerializer.serializer_field_mapping[I18nCharField] = I18nField
-I18nAwareModelSerializer.serializer_field_mapping[I18nTextField] = I18nField
+for field_class in (I18nCharField, I18nTextField, I18nJSONCharField, I18nJSONTextField):
+    I18nAwareModelSerializer.serializer_field_mapping[field_class] = I18nField
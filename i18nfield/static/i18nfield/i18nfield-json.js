@@ -0,0 +1,23 @@
+/*
+ * Keeps the hidden JSON inputs of I18nJSONTextInput and I18nJSONTextarea widgets in sync
+ * with the inputs of the single languages.
+ */
+(function () {
+    "use strict";
+
+    function sync(hidden) {
+        var group = hidden.previousElementSibling;
+        var data = JSON.parse(hidden.value || "{}");
+        group.querySelectorAll("[lang]").forEach(function (input) {
+            data[input.getAttribute("lang")] = input.value;
+        });
+        hidden.value = JSON.stringify(data);
+    }
+
+    document.addEventListener("input", function (e) {
+        var group = e.target.closest(".i18n-form-group");
+        if (group && group.nextElementSibling && group.nextElementSibling.hasAttribute("data-i18n-json")) {
+            sync(group.nextElementSibling);
+        }
+    });
+})();
@@ -1,32 +1,199 @@
-from typing import Dict, Optional, Union
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 
+import hashlib
 import json
-from django.conf import settings
+import sys
+from django.core.signals import setting_changed
+from django.dispatch import receiver
 from django.utils import translation
+from django.utils.autoreload import file_changed
 from django.utils.translation import gettext, override
+from functools import lru_cache
+
+from .languages import get_languages
+
+
+# Incremented whenever the translation catalogs might have changed, which invalidates
+# the translations cached by LazyGettextProxy instances
+_catalog_generation = 0
+
+
+def _reset_catalogs():
+    global _catalog_generation
+    _catalog_generation += 1
+
+
+@receiver(setting_changed)
+def _setting_changed(setting, **kwargs):
+    if setting in ('LANGUAGES', 'LANGUAGE_CODE', 'LOCALE_PATHS', 'INSTALLED_APPS'):
+        _reset_catalogs()
+
+
+@receiver(file_changed)
+def _file_changed(file_path, **kwargs):
+    if file_path.suffix == '.mo':
+        _reset_catalogs()
+
+
+@lru_cache(maxsize=1024)
+def _fallback_chain(lng: str, keys: Tuple[str, ...], default: str,
+                    fallbacks: Optional[Tuple[str, ...]] = None) -> Tuple[str, ...]:
+    """
+    Compiles the order in which the keys of a translation dictionary are tried when
+    localizing it to ``lng``: The exact match, the base language, regional variants
+    of the base language, the system's default language and finally all other keys
+    in their original order. Only keys contained in ``keys`` are part of the result.
+
+    If ``fallbacks`` are given, e.g. from ``settings.I18NFIELD_FALLBACKS``, they replace
+    the base language, regional variants and default language.
+    """
+    candidates = [lng]
+    if fallbacks is not None:
+        candidates += fallbacks
+    else:
+        firstpart = lng.split('-')[0]
+        candidates.append(firstpart)
+        candidates += [loc for loc in keys if loc.startswith(firstpart + "-") or firstpart == loc]
+        candidates.append(default)
+    candidates += keys
+
+    keyset = set(keys)
+    chain = []
+    for loc in candidates:
+        if loc in keyset and loc not in chain:
+            chain.append(loc)
+    return tuple(chain)
+
+
+def _parse(raw: str):
+    try:
+        data = json.loads(raw)
+    except ValueError:
+        return raw
+    if isinstance(data, dict):
+        # Share the locale code strings between all instances instead of keeping
+        # one copy per parsed value
+        data = {sys.intern(k): v for k, v in data.items()}
+    return data
+
+
+# Parsed data of LazyI18nString(…, shared=True), which must never be modified
+_parse_shared = lru_cache(maxsize=4096)(_parse)
 
 
 class LazyI18nString:
     """
     This represents an internationalized string that is/was/will be stored in the database.
     """
+    __slots__ = ('_raw', '_data', '_parsed', '_dirty', '_localized', '_hash', '_digest', '_shared')
 
-    def __init__(self, data: Optional[Union[str, Dict[str, str]]]):
+    def __init__(self, data: Optional[Union[str, Dict[str, str]]], memoize: bool = False, shared: bool = False):
         """
         Creates a new i18n-aware string.
 
         :param data: If this is a dictionary, it is expected to map language codes to translations.
             If this is a string that can be parsed as JSON, it will be parsed and used as such a dictionary.
             If this is anything else, it will be cast to a string and used for all languages.
+            Strings are only parsed once the data is accessed for the first time, so values that
+            are loaded from the database but never used do not cause any parsing overhead.
+        :param memoize: If set, the result of ``localize`` is remembered for every language until
+            the data is modified. This is useful if the same value is rendered many times.
+        :param shared: If set and ``data`` is a string, the parsed data is shared with all other
+            shared values created from an identical string. The data is copied before it is
+            handed out for modification. This saves time and memory if many values are equal.
         """
-        self.data = data
-        if isinstance(self.data, str) and self.data is not None:
-            try:
-                j = json.loads(self.data)
-            except ValueError:
-                pass
-            else:
-                self.data = j
+        if isinstance(data, str):
+            self._raw = data
+            self._data = None
+            self._parsed = False
+        else:
+            self._raw = None
+            self._data = data
+            self._parsed = True
+        self._dirty = False
+        self._localized = {} if memoize else None
+        self._hash = None
+        self._digest = None
+        self._shared = shared
+
+    def _get_data(self):
+        if not self._parsed:
+            self._data = _parse_shared(self._raw) if self._shared else _parse(self._raw)
+            self._parsed = True
+        return self._data
+
+    @property
+    def data(self):
+        """
+        The dictionary mapping language codes to translations, or any non-dictionary
+        value this string has been created with.
+
+        As a dictionary returned here might be modified in-place, this string is
+        considered as modified as soon as its dictionary has been accessed.
+        """
+        data = self._get_data()
+        if isinstance(data, dict):
+            if self._shared:
+                # Copy on write, the parsed data is shared with other values
+                data = self._data = dict(data)
+                self._shared = False
+            self._changed()
+        return data
+
+    def get_data(self):
+        """
+        Returns the same as ``data``, but does not consider this string as modified. Use
+        this to read the translations, e.g. to serialize them. The returned dictionary
+        must not be modified, as it might be shared with other values.
+        """
+        return self._get_data()
+
+    @data.setter
+    def data(self, value):
+        self._parsed = True
+        self._data = value
+        self._shared = False
+        self._changed()
+
+    def _changed(self):
+        self._dirty = True
+        self._hash = None
+        self._digest = None
+        if self._localized:
+            self._localized.clear()
+
+    @property
+    def raw(self) -> Optional[str]:
+        """
+        The string this value has been created from, e.g. the value stored in the
+        database, as long as the data has not been modified since. Otherwise, this
+        is ``None``.
+        """
+        if self._dirty:
+            return None
+        return self._raw
+
+    def has_changed(self) -> bool:
+        """
+        Returns whether the data has been modified since this value has been created. If it
+        has been created from a string, e.g. the value loaded from the database, the current
+        data is compared to the parsed string, so that accessing ``data`` without changing
+        anything does not count as a modification.
+        """
+        if not self._dirty:
+            return False
+        if self._raw is None:
+            return True
+        return self._get_data() != _parse(self._raw)
+
+    def raw_json(self) -> Optional[str]:
+        """
+        Like ``raw``, but only returns the string if it is a JSON-encoded dictionary
+        of translations, which makes it safe to embed into other JSON documents as-is.
+        """
+        if self._dirty or self._raw is None or not isinstance(self._get_data(), dict):
+            return None
+        return self._raw
 
     def __str__(self) -> str:
         """
@@ -36,13 +203,14 @@ class LazyI18nString:
         the string in the system's default language. If this is unavailable as well, it
         will give you the string in the first language available.
         """
-        return self.localize(translation.get_language() or settings.LANGUAGE_CODE)
+        return self.localize(translation.get_language() or get_languages().default)
 
     def __bool__(self) -> bool:
-        if not self.data:
+        data = self._get_data()
+        if not data:
             return False
-        if isinstance(self.data, dict):
-            return any(self.data.values())
+        if isinstance(data, dict):
+            return any(data.values())
         return True
 
     def localize(self, lng: str) -> str:
@@ -57,43 +225,37 @@ class LazyI18nString:
             or region like ``de-AT``, exact matches will be used preferably, but if only
             a ``de`` or ``de-AT`` translation exists, this might be returned as well.
         """
-        if self.data is None:
+        if self._localized is not None:
+            try:
+                return self._localized[lng]
+            except KeyError:
+                result = self._localized[lng] = self._localize(lng)
+                return result
+        return self._localize(lng)
+
+    def _localize(self, lng: str) -> str:
+        data = self._get_data()
+        if data is None:
             return ""
 
-        if isinstance(self.data, dict):
-            firstpart = lng.split('-')[0]
-            similar = [
-                loc for loc in self.data.keys()
-                if (loc.startswith(firstpart + "-") or firstpart == loc) and loc != lng
-            ]
-            if self.data.get(lng):
-                return self.data[lng]
-            elif self.data.get(firstpart):
-                return self.data[firstpart]
-            elif similar and any([self.data.get(s) for s in similar]):
-                for s in similar:
-                    if self.data.get(s):
-                        return self.data.get(s)
-            elif self.data.get(settings.LANGUAGE_CODE):
-                return self.data[settings.LANGUAGE_CODE]
-            else:
-                filled = [f for f in self.data.values() if f]
-                if filled:
-                    return filled[0]
-                else:
-                    return ""
+        if isinstance(data, dict):
+            languages = get_languages()
+            for loc in _fallback_chain(lng, tuple(data), languages.default, languages.fallbacks.get(lng)):
+                if data[loc]:
+                    return data[loc]
+            return ""
         else:
             with override(lng):
-                return str(self.data)
+                return str(data)
 
     def map(self, f):
         """
         Apply a transformation function f to all translations.
         """
-        self.data = {k: f(v) for k, v in self.data.items()}
+        self.data = {k: f(v) for k, v in self._get_data().items()}
 
     def __repr__(self) -> str:  # NOQA
-        return '<LazyI18nString: %s>' % repr(self.data)
+        return '<LazyI18nString: %s>' % repr(self._get_data())
 
     def __lt__(self, other) -> bool:  # NOQA
         return str(self) < str(other)
@@ -101,20 +263,101 @@ class LazyI18nString:
     def __format__(self, format_spec):
         return self.__str__()
 
+    def __hash__(self):
+        if self._hash is None:
+            data = self._get_data()
+            self._hash = hash(frozenset(data.items()) if isinstance(data, dict) else data)
+        return self._hash
+
+    def __getstate__(self):
+        state = {slot: getattr(self, slot) for slot in LazyI18nString.__slots__}
+        # Hashes of strings differ between processes
+        state['_hash'] = None
+        # Copies must not share the memoized translations, they may be modified independently
+        state['_localized'] = {} if self._localized is not None else None
+        return None, state
+
+    def __setstate__(self, state):
+        if isinstance(state, tuple):
+            state = state[1]
+        if '_raw' not in state:
+            # Pickled by a version without __slots__, which only stored the parsed data
+            self.__init__(None)
+            self._data = state.get('data')
+            return
+        for slot, value in state.items():
+            setattr(self, slot, value)
+
+    @property
+    def digest(self) -> str:
+        """
+        A SHA-256 hex digest of the translations, which is independent of the order of the
+        languages and stable across processes. Use it e.g. for ETags or cache keys.
+        """
+        if self._digest is None:
+            data = self._get_data()
+            if isinstance(data, LazyI18nString.LazyGettextProxy):
+                data = data.to_dict()
+            elif data is not None and not isinstance(data, dict):
+                data = str(data)
+            payload = json.dumps(data, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+            self._digest = hashlib.sha256(payload.encode()).hexdigest()
+        return self._digest
+
     def __eq__(self, other):
         if other is None:
             return False
+        if isinstance(other, LazyI18nString):
+            return self._get_data() == other._get_data()
         if hasattr(other, 'data'):
-            return self.data == other.data
-        return self.data == other
+            return self._get_data() == other.data
+        return self._get_data() == other
 
     class LazyGettextProxy:
+        """
+        Resolves a gettext string in the language it is indexed with. The translations
+        are cached until the translation catalogs are reloaded.
+        """
+        __slots__ = ('lazygettext', '_cache', '_generation')
+
         def __init__(self, lazygettext):
             self.lazygettext = lazygettext
+            self._cache = {}
+            self._generation = _catalog_generation
 
         def __getitem__(self, item):
-            with override(item):
-                return str(gettext(self.lazygettext))
+            if self._generation != _catalog_generation:
+                self._cache = {}
+                self._generation = _catalog_generation
+            try:
+                return self._cache[item]
+            except KeyError:
+                with override(item):
+                    result = self._cache[item] = str(gettext(self.lazygettext))
+                return result
+
+        def to_dict(self, languages: Optional[Iterable[str]] = None) -> Dict[str, str]:
+            """
+            Resolves the string in all given languages at once and returns a dictionary
+            of all non-empty translations.
+
+            :param languages: The locale codes to resolve. Defaults to all languages in
+                ``settings.LANGUAGES``.
+            """
+            if languages is None:
+                languages = get_languages().codes
+            result = {}
+            for lng in languages:
+                value = self[lng]
+                if value:
+                    result[lng] = value
+            return result
+
+        def __setstate__(self, state):
+            if isinstance(state, tuple):
+                state = state[1]
+            # Pickles of versions without __slots__ do not contain the cache
+            self.__init__(state['lazygettext'])
 
         def __contains__(self, item):
             return True
@@ -130,3 +373,51 @@ class LazyI18nString:
         result = LazyI18nString({})
         result.data = cls.LazyGettextProxy(lazygettext)
         return result
+
+
+class PartialI18nString(LazyI18nString):
+    """
+    A ``LazyI18nString`` that only contains the translations required to display it in
+    one language, e.g. because it has been loaded with ``I18nQuerySet.localized``. As
+    saving it would drop all other translations, it can not be written to the database.
+    """
+    __slots__ = ()
+
+    def __repr__(self) -> str:  # NOQA
+        return '<PartialI18nString: %s>' % repr(self._get_data())
+
+
+def localize_many(values: Iterable[Optional[LazyI18nString]], lng: str) -> List[str]:
+    """
+    Localizes many values to the same language at once. This returns the same results as
+    calling ``localize`` on every value, but the fallback order is only computed once for
+    all values containing the same languages, which makes it considerably faster for long
+    lists, e.g. when exporting data.
+
+    :param values: ``LazyI18nString`` instances, ``None`` values result in empty strings.
+    :param lng: A locale code, e.g. ``de``.
+    """
+    languages = get_languages()
+    default, fallbacks = languages.default, languages.fallbacks.get(lng)
+    chains = {}
+    result = []
+    append = result.append
+    for value in values:
+        if value is None:
+            append("")
+            continue
+        data = value._get_data()
+        if value._localized is not None or not isinstance(data, dict):
+            append(value.localize(lng))
+            continue
+        keys = tuple(data)
+        chain = chains.get(keys)
+        if chain is None:
+            chain = chains[keys] = _fallback_chain(lng, keys, default, fallbacks)
+        for loc in chain:
+            if data[loc]:
+                append(data[loc])
+                break
+        else:
+            append("")
+    return result
@@ -1,13 +1,38 @@
+import re
+import uuid
 from django.core.serializers.json import DjangoJSONEncoder
 from django.db.models import Model, QuerySet
 
 from .strings import LazyI18nString
 
 
-class I18nJSONEncoder(DjangoJSONEncoder):
+class RawI18nJSONMixin:
+    """
+    Mixin for JSON encoders that embeds the stored JSON of unmodified ``LazyI18nString``
+    objects into the output verbatim instead of encoding their data again.
+    """
+
+    def iterencode(self, o, _one_shot=False):
+        self._raw_fragments = []
+        self._raw_token = uuid.uuid4().hex
+        placeholder = re.compile('"%s(\\d+)"' % self._raw_token)
+        for chunk in super().iterencode(o, _one_shot):
+            if self._raw_fragments and self._raw_token in chunk:
+                chunk = placeholder.sub(lambda m: self._raw_fragments[int(m.group(1))], chunk)
+            yield chunk
+
+    def encode_i18n(self, obj: LazyI18nString):
+        raw = obj.raw_json()
+        if raw is None or not hasattr(self, '_raw_fragments'):
+            return obj.get_data()
+        self._raw_fragments.append(raw)
+        return '%s%d' % (self._raw_token, len(self._raw_fragments) - 1)
+
+
+class I18nJSONEncoder(RawI18nJSONMixin, DjangoJSONEncoder):
     def default(self, obj):
         if isinstance(obj, LazyI18nString):
-            return obj.data
+            return self.encode_i18n(obj)
         elif isinstance(obj, QuerySet):
             return list(obj)
         elif isinstance(obj, Model):
@@ -41,4 +41,5 @@ setup(
 
     packages=find_packages(exclude=['tests', 'tests.*', 'demoproject', 'demoproject.*']),
     include_package_data=True,
+    package_data={'i18nfield': ['static/i18nfield/*.js']},
 )
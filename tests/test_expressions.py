@@ -0,0 +1,59 @@
+import pytest
+from django.test import override_settings
+
+from i18nfield.expressions import (
+    I18nKey, Localize, db_fallback_chain, preferred_languages,
+)
+from i18nfield.strings import LazyI18nString
+
+from .testapp.models import Author, Book
+
+
+@pytest.fixture
+def books():
+    a = Author.objects.create(name='Tolkien')
+    return [
+        Book.objects.create(author=a, title=LazyI18nString({'de': 'Der Hobbit', 'en': 'The Hobbit'}), abstract=''),
+        Book.objects.create(author=a, title=LazyI18nString({'en': 'Silmarillion'}), abstract=''),
+        Book.objects.create(author=a, title=LazyI18nString({'fr': 'Contes et légendes inachevés'}), abstract=''),
+        Book.objects.create(author=a, title='Beowulf', abstract=''),
+        Book.objects.create(author=a, title=LazyI18nString({'de': 'Auf', 'de-informal': 'Du', 'en': ''}), abstract=''),
+    ]
+
+
+def test_db_fallback_chain():
+    assert db_fallback_chain('de') == ('de', 'en', 'fr')
+    assert db_fallback_chain('fr-CA') == ('fr-CA', 'fr', 'en', 'de')
+    with override_settings(LANGUAGES=[('de', 'German'), ('de-informal', 'German (informal)'), ('en', 'English')]):
+        assert db_fallback_chain('de-AT') == ('de-AT', 'de', 'de-informal', 'en')
+    with override_settings(I18NFIELD_FALLBACKS={'de-CH': ['fr', 'de']}):
+        assert db_fallback_chain('de-CH') == ('de-CH', 'fr', 'de', 'en')
+        assert preferred_languages('de-CH') == ('de-CH', 'fr', 'de')
+
+
+@pytest.mark.django_db
+def test_localize_annotate(books):
+    qs = Book.objects.annotate(t=Localize('title', 'de')).order_by('pk')
+    assert [b.t for b in qs] == ['Der Hobbit', 'Silmarillion', 'Contes et légendes inachevés', 'Beowulf', 'Auf']
+    assert [b.t for b in qs] == [b.title.localize('de') for b in qs]
+    qs = Book.objects.annotate(t=Localize('title', 'en')).order_by('pk')
+    assert [b.t for b in qs] == ['The Hobbit', 'Silmarillion', 'Contes et légendes inachevés', 'Beowulf', 'Auf']
+    assert [b.t for b in qs] == [b.title.localize('en') for b in qs]
+
+
+@pytest.mark.django_db
+def test_localize_order_by(books):
+    titles = Book.objects.order_by(Localize('title', 'en')).values_list(Localize('title', 'en'), flat=True)
+    assert list(titles) == sorted(b.title.localize('en') for b in Book.objects.all())
+
+
+@pytest.mark.django_db
+def test_localize_filter(books):
+    qs = Book.objects.annotate(t=Localize('title', 'fr')).filter(t='The Hobbit')
+    assert list(qs) == [books[0]]
+
+
+@pytest.mark.django_db
+def test_key(books):
+    qs = Book.objects.annotate(t=I18nKey('title', 'de')).order_by('pk')
+    assert [b.t for b in qs] == ['Der Hobbit', None, None, None, 'Auf']
@@ -1,10 +1,11 @@
 import pytest
 from django.core import serializers
 
-from i18nfield.fields import I18nFieldMixin
+from i18nfield.expressions import Localize
+from i18nfield.fields import I18nCharField, I18nFieldMixin
 from i18nfield.strings import LazyI18nString
 
-from .testapp.models import Author, Book
+from .testapp.models import Author, Book, Magazine
 
 
 @pytest.mark.django_db
@@ -33,6 +34,22 @@ def test_simple_string():
     assert isinstance(b.abstract, LazyI18nString)
 
 
+@pytest.mark.django_db
+def test_save_unmodified_passthrough():
+    a = Author.objects.create(name='Tolkien')
+    b = Book.objects.create(author=a, title='{"en": "The Hobbit",  "de": ""}', abstract='Plain')
+    b = Book.objects.get(pk=b.pk)
+    assert b.title.raw == '{"en": "The Hobbit",  "de": ""}'
+    assert I18nFieldMixin().get_prep_value(b.title) == '{"en": "The Hobbit",  "de": ""}'
+    assert I18nFieldMixin().get_prep_value(b.abstract) == 'Plain'
+
+    b.title.data['de'] = 'Der kleine Hobbit'
+    assert b.title.raw is None
+    b.save()
+    b = Book.objects.get(pk=b.pk)
+    assert b.title.raw == '{"de": "Der kleine Hobbit", "en": "The Hobbit"}'
+
+
 def test_to_python():
     mx = I18nFieldMixin()
     mx.to_python('A') == LazyI18nString('A')
@@ -114,3 +131,57 @@ def test_initializing_with_string_only():
         assert book.object.abstract.data == "Frodo will einen Ring zerstören"
 
         break
+
+
+@pytest.mark.django_db
+def test_json_save_cycle():
+    title = LazyI18nString({'de': 'Die Zeit', 'en': 'The Time'})
+    Magazine.objects.create(title=title, description='Weekly')
+    m = Magazine.objects.get()
+    assert m.title == title
+    assert m.title.raw == '{"de": "Die Zeit", "en": "The Time"}'
+    assert m.description == 'Weekly'
+    assert m.description.localize('de') == 'Weekly'
+
+    m.title.data['fr'] = 'Le Temps'
+    m.description = None
+    m.save()
+    m = Magazine.objects.get()
+    assert m.title.localize('fr') == 'Le Temps'
+    assert m.description.data is None
+
+
+@pytest.mark.django_db
+def test_json_lookups():
+    m1 = Magazine.objects.create(title=LazyI18nString({'de': 'Die Zeit', 'en': 'The Time'}))
+    m2 = Magazine.objects.create(title='Plain')
+    assert list(Magazine.objects.filter(title__de__icontains='zeit')) == [m1]
+    assert list(Magazine.objects.filter(title__has_lang='en')) == [m1]
+    assert list(Magazine.objects.filter(title__any='The Time')) == [m1]
+    assert list(Magazine.objects.annotate(t=Localize('title', 'fr')).order_by('pk').values_list('t', flat=True)) == [
+        'The Time', 'Plain'
+    ]
+    assert m2.pk
+
+
+def test_json_full_clean():
+    m = Magazine(title=LazyI18nString({'de': 'Die Zeit'}))
+    m.full_clean()
+
+
+@pytest.mark.django_db
+def test_memoize_option():
+    field = I18nCharField(memoize=True)
+    assert field.deconstruct()[3]['memoize'] is True
+    assert 'memoize' not in I18nCharField().deconstruct()[3]
+    assert field.from_db_value('{"en": "Hello"}', None, None)._localized == {}
+    assert Book._meta.get_field('title').from_db_value('{"en": "Hello"}', None, None)._localized is None
+
+
+def test_shared_option():
+    field = I18nCharField(shared=True)
+    assert field.deconstruct()[3]['shared'] is True
+    assert 'shared' not in I18nCharField().deconstruct()[3]
+    v1 = field.from_db_value('{"en": "Hello"}', None, None)
+    v2 = field.from_db_value('{"en": "Hello"}', None, None)
+    assert v1._get_data() is v2._get_data()
@@ -1,11 +1,16 @@
+import copy
+import json
 import pytest
+from django import forms
 from django.core.exceptions import ValidationError
 from django.forms import inlineformset_factory, modelformset_factory
+from django.test import override_settings
+from django.utils.safestring import mark_safe
 from lxml.html import html5parser
 
 from i18nfield.forms import (
-    I18nForm, I18nFormField, I18nInlineFormSet, I18nModelFormSet,
-    I18nTextInput,
+    I18nForm, I18nFormField, I18nInlineFormSet, I18nJSONFormField,
+    I18nJSONTextarea, I18nJSONTextInput, I18nModelFormSet, I18nTextarea, I18nTextInput,
 )
 from i18nfield.strings import LazyI18nString
 
@@ -210,3 +215,183 @@ def test_widget_decompress_first_two_enabled_not_filled():
     assert f.widget.decompress({'fr': 'Bonjour'}) == [
         None, None, 'Bonjour'
     ]
+
+
+def test_widget_enabled_locales_configured_fallbacks():
+    f = I18nFormField(widget=I18nTextInput, required=False)
+    f.widget.enabled_locales = ['de']
+    with override_settings(I18NFIELD_FALLBACKS={'de': ['fr']}):
+        rendered = f.widget.render('foo', LazyI18nString({'en': 'Hello', 'fr': 'Bonjour'}))
+    tree = html5parser.fromstring(rendered)
+    assert tree[0].attrib == {
+        'lang': 'de', 'name': 'foo_0', 'type': 'text', 'value': 'Bonjour'
+    }
+
+
+def test_widget_regional_siblings():
+    with override_settings(LANGUAGES=[('de', 'German'), ('de-at', 'Austrian German'), ('en', 'English')]):
+        f = I18nFormField(widget=I18nTextInput, required=False)
+        f.widget.enabled_locales = ['de']
+        value = LazyI18nString('{"de-at": "Servus", "en": "Hello"}')
+        rendered = f.widget.render('foo', value, attrs={'id': 'bla'})
+    tree = html5parser.fromstring(rendered)
+    assert tree[0].attrib == {
+        'lang': 'de', 'name': 'foo_0', 'type': 'text', 'value': 'Servus',
+        'id': 'bla_0', 'title': 'German', 'placeholder': 'German',
+    }
+    assert not value.has_changed()
+    assert value.raw is not None
+
+
+def test_widget_empty_configured_fallbacks():
+    languages = [('de', 'German'), ('de-at', 'Austrian German'), ('en', 'English')]
+    with override_settings(LANGUAGES=languages, I18NFIELD_FALLBACKS={'de': []}):
+        f = I18nFormField(widget=I18nTextInput, required=False)
+        f.widget.enabled_locales = ['de', 'en']
+        value = LazyI18nString({'en': 'Hello', 'de-at': 'Servus'})
+        rendered = f.widget.render('foo', value)
+        assert value.localize('de') == 'Hello'
+    tree = html5parser.fromstring(rendered)
+    assert 'value' not in tree[0].attrib
+    assert tree[1].attrib['value'] == 'Hello'
+
+
+def test_lazy_subwidgets_and_subfields():
+    sf = SimpleForm({'title_0': 'Hallo', 'title_2': 'Bonjour'}, locales=['de'])
+    field = sf.fields['title']
+    assert field._fields is None
+    assert field.widget._widgets == {}
+    sf.as_p()
+    assert list(field.widget._widgets) == [0]
+    assert sf.is_valid()
+    assert sf.cleaned_data['title'].data == {'de': 'Hallo', 'en': '', 'fr': 'Bonjour'}
+    assert field._fields is None
+    assert sf.has_changed()
+
+
+def test_lazy_subfields_materialized():
+    f = I18nFormField(widget=I18nTextInput, label='Title', max_length=5)
+    assert [(sub.locale, sub.label) for sub in f.fields] == [('de', 'Title (de)'), ('en', 'Title (en)'), ('fr', 'Title (fr)')]
+    f.fields[1].max_length = None
+    f.fields[1].validators = []
+    assert f.clean(['Hallo', 'Hello world', '']).data == {'de': 'Hallo', 'en': 'Hello world', 'fr': ''}
+    with pytest.raises(ValidationError):
+        f.clean(['Hallo Welt', '', ''])
+
+
+def test_deepcopy_keeps_subwidgets_lazy():
+    f = I18nFormField(widget=I18nTextInput)
+    f.widget.render('foo', None)
+    f2 = copy.deepcopy(f)
+    assert f2.widget._widgets.keys() == f.widget._widgets.keys()
+    assert f2.widget._widgets[0] is not f.widget._widgets[0]
+    assert f2._fields is None
+    assert len(f2.widget.widgets) == 3
+    assert f2.widget.value_from_datadict({'foo_1': 'Hello'}, {}, 'foo') == [None, 'Hello', None]
+    assert f2.widget.value_omitted_from_data({'bar_1': 'Hello'}, {}, 'foo')
+
+
+def test_deepcopy_shares_immutable_state():
+    f = I18nFormField(widget=I18nTextInput)
+    f2 = copy.deepcopy(f)
+    assert f2.widget.field is f2
+    assert f2.widget.locales is f.widget.locales
+    assert f2._default_subfield is f._default_subfield
+    f2.widget.enabled_locales.remove('de')
+    assert f.widget.enabled_locales == ['de', 'en', 'fr']
+    f2.widget.attrs['class'] = 'foo'
+    assert 'class' not in f.widget.attrs
+
+
+def test_form_instances_independent():
+    sf1 = SimpleForm(locales=['de'])
+    sf2 = SimpleForm()
+    assert sf1.fields['title'].widget.enabled_locales == ['de']
+    assert sf2.fields['title'].widget.enabled_locales == ['de', 'en', 'fr']
+    assert SimpleForm.base_fields['title'].widget.enabled_locales == ['de', 'en', 'fr']
+
+
+@pytest.mark.parametrize('widget', [I18nTextInput, I18nTextarea])
+@pytest.mark.parametrize('value', [
+    None,
+    LazyI18nString({'de': 'Hallo <b>Welt</b> & "du"', 'en': ''}),
+    LazyI18nString({'de': mark_safe('<b>safe</b>'), 'en': 'Hello'}),
+    LazyI18nString('Plain'),
+    ['1', '', None],
+])
+def test_fast_render(widget, value):
+    f = I18nFormField(widget=widget, required=False, widget_kwargs={'attrs': {'class': 'a"b', 'data-x': True}})
+    fast = I18nFormField(widget=widget, required=False, widget_kwargs={'attrs': {'class': 'a"b', 'data-x': True}, 'fast_render': True})
+    attrs = {'id': 'id_foo', 'required': False, 'autofocus': True}
+    assert fast.widget.render('foo', value, attrs=dict(attrs)) == f.widget.render('foo', value, attrs=dict(attrs))
+    assert fast.widget.render('foo', value) == f.widget.render('foo', value)
+
+
+def test_fast_render_other_widgets():
+    class I18nEmailInput(I18nTextInput):
+        widget = forms.EmailInput
+        fast_render = True
+
+    f = I18nFormField(widget=I18nEmailInput, required=False)
+    assert 'type="email"' in f.widget.render('foo', LazyI18nString({'de': 'a@example.org'}))
+
+
+class JSONForm(I18nForm):
+    title = I18nJSONFormField()
+    abstract = I18nJSONFormField(widget=I18nJSONTextarea, required=False)
+
+
+def test_json_widget_render():
+    form = JSONForm(initial={'title': LazyI18nString({'de': 'Hallo "du"', 'en': 'Hello'})}, locales=['de', 'en'])
+    rendered = str(form['title'])
+    tree = html5parser.fragments_fromstring(rendered)
+    inputs = tree[0].findall('.//{http://www.w3.org/1999/xhtml}input')
+    assert [(i.get('lang'), i.get('name'), i.get('value')) for i in inputs] == [('de', '', 'Hallo "du"'), ('en', '', 'Hello')]
+    assert tree[1].attrib['name'] == 'title'
+    assert json.loads(tree[1].attrib['value']) == {'de': 'Hallo "du"', 'en': 'Hello'}
+    assert 'i18nfield/i18nfield-json.js' in str(form.media)
+
+
+def test_json_widget_submit():
+    form = JSONForm({'title': json.dumps({'de': 'Hallo', 'fr': 'Bonjour', 'xx': 'Nope', 'en': 3})})
+    assert form.is_valid()
+    assert form.cleaned_data['title'].data == {'de': 'Hallo', 'en': '', 'fr': 'Bonjour'}
+    assert form.cleaned_data['abstract'].data == {'de': '', 'en': '', 'fr': ''}
+
+    form = JSONForm({'title': json.dumps({'de': ''})})
+    assert not form.is_valid()
+    form = JSONForm({'title': 'invalid'})
+    assert not form.is_valid()
+    form = JSONForm({'title': '[]'})
+    assert not form.is_valid()
+    assert JSONForm({}).fields['title'].widget.value_omitted_from_data({}, {}, 'title')
+
+
+def test_json_form_field_clean_string():
+    f = I18nJSONFormField()
+    assert f.clean('{"en": "Hello"}').data == {'de': '', 'en': 'Hello', 'fr': ''}
+    with pytest.raises(ValidationError):
+        f.clean('{}')
+
+
+@pytest.mark.django_db
+def test_json_form_field_modelformset():
+    a = Author.objects.create(name='Tolkien')
+    b = Book.objects.create(author=a, title=LazyI18nString({'en': 'The Hobbit'}), abstract='')
+
+    FormSetClass = modelformset_factory(
+        Book, form=BookForm, formset=I18nModelFormSet,
+        field_classes={'title': I18nJSONFormField, 'abstract': I18nJSONFormField}, extra=0
+    )
+    fs = FormSetClass(queryset=Book.objects.all())
+    assert isinstance(fs.forms[0].fields['title'].widget, I18nJSONTextInput)
+    assert isinstance(fs.forms[0].fields['abstract'].widget, I18nJSONTextarea)
+
+    fs = FormSetClass({
+        'form-TOTAL_FORMS': '1', 'form-INITIAL_FORMS': '1', 'form-0-id': str(b.pk), 'form-0-author': str(a.pk),
+        'form-0-title': json.dumps({'de': 'Der Hobbit', 'en': 'The Hobbit'}), 'form-0-abstract': json.dumps({'en': 'Bilbo'}),
+    }, queryset=Book.objects.all())
+    assert fs.is_valid(), fs.errors
+    fs.save()
+    b.refresh_from_db()
+    assert b.title.data == {'de': 'Der Hobbit', 'en': 'The Hobbit'}
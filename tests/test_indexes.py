@@ -0,0 +1,47 @@
+import pytest
+from django.db import connection
+
+from i18nfield.expressions import I18nKey
+from i18nfield.indexes import I18nLanguageIndex
+
+from .testapp.models import Book, Magazine
+
+
+def test_deconstruct():
+    index = I18nLanguageIndex(fields=['title'], language='de', lower=True, name='book_title_de')
+    path, args, kwargs = index.deconstruct()
+    assert path == 'i18nfield.indexes.I18nLanguageIndex'
+    assert args == ()
+    assert kwargs == {'fields': ['title'], 'language': 'de', 'lower': True, 'name': 'book_title_de'}
+    assert index.clone().deconstruct() == index.deconstruct()
+
+
+def test_opclasses_unsupported(monkeypatch):
+    index = I18nLanguageIndex(fields=['title'], language='de', opclasses=['text_pattern_ops'], name='book_title_de')
+    assert index.deconstruct()[2]['opclasses'] == ['text_pattern_ops']
+    monkeypatch.setattr('i18nfield.indexes.OpClass', None)
+    with pytest.raises(ValueError):
+        I18nLanguageIndex(fields=['title'], language='de', opclasses=['text_pattern_ops'], name='book_title_de')
+    I18nLanguageIndex(fields=['title'], language='de', name='book_title_de')
+
+
+def _query_plan(qs):
+    sql, params = qs.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+        return ' '.join(str(row) for row in cursor.fetchall())
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize('model', (Book, Magazine))
+def test_index_used(model):
+    index = I18nLanguageIndex(fields=['title'], language='de', name='title_de_idx')
+    with connection.schema_editor() as editor:
+        editor.add_index(model, index)
+    try:
+        assert 'title_de_idx' in _query_plan(model.objects.filter(title__de='Der Hobbit'))
+        assert 'title_de_idx' in _query_plan(model.objects.order_by(I18nKey('title', 'de')))
+        assert 'title_de_idx' not in _query_plan(model.objects.filter(title__en='The Hobbit'))
+    finally:
+        with connection.schema_editor() as editor:
+            editor.remove_index(model, index)
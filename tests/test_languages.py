@@ -0,0 +1,40 @@
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.test import override_settings
+
+from i18nfield.languages import get_languages
+
+
+def test_registry():
+    languages = get_languages()
+    assert languages.codes == ('de', 'en', 'fr')
+    assert languages.valid == {'de', 'en', 'fr'}
+    assert languages.default == 'en'
+    assert str(languages.names['de']) == 'German'
+    assert get_languages() is languages
+
+
+def test_registry_groups():
+    with override_settings(LANGUAGES=[('de', 'German'), ('de-AT', 'Austrian German'), ('en', 'English'), ('de-CH', 'Swiss German')]):
+        languages = get_languages()
+        assert languages.groups == {'de': ('de', 'de-AT', 'de-CH'), 'en': ('en',)}
+        assert languages.siblings['de-AT'] == ('de', 'de-CH')
+        assert languages.siblings['en'] == ()
+    assert get_languages().codes == ('de', 'en', 'fr')
+
+
+def test_registry_rebuilt_on_setting_changed():
+    languages = get_languages()
+    with override_settings(LANGUAGE_CODE='de'):
+        assert get_languages() is not languages
+        assert get_languages().default == 'de'
+    assert get_languages().default == 'en'
+
+
+def test_registry_fallbacks():
+    assert get_languages().fallbacks == {}
+    with override_settings(I18NFIELD_FALLBACKS={'de-CH': ['de', 'en']}):
+        assert get_languages().fallbacks == {'de-CH': ('de', 'en')}
+    with override_settings(I18NFIELD_FALLBACKS={'de-CH': 'de'}):
+        with pytest.raises(ImproperlyConfigured):
+            get_languages()
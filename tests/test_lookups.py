@@ -0,0 +1,56 @@
+import pytest
+
+from i18nfield.strings import LazyI18nString
+
+from .testapp.models import Author, Book, Magazine
+
+
+@pytest.fixture
+def books():
+    a = Author.objects.create(name='Tolkien')
+    return [
+        Book.objects.create(author=a, title={'de': 'Der Herr der Ringe', 'en': 'The Lord of the Rings'}, abstract=''),
+        Book.objects.create(author=a, title={'en': 'The Hobbit', 'fr': ''}, abstract=''),
+        Book.objects.create(author=a, title={'fr': 'Le Silmarillion'}, abstract=''),
+        Book.objects.create(author=a, title='Beowulf', abstract=''),
+    ]
+
+
+@pytest.mark.django_db
+def test_language_lookups(books):
+    assert list(Book.objects.filter(title__de__icontains='ringe')) == [books[0]]
+    assert list(Book.objects.filter(title__en__icontains='ringe')) == []
+    assert list(Book.objects.filter(title__en='The Hobbit')) == [books[1]]
+    assert list(Book.objects.filter(title__en__exact='The Hobbit')) == [books[1]]
+    assert list(Book.objects.filter(title__de__isnull=True).order_by('pk')) == books[1:]
+    assert list(Book.objects.filter(title__en__startswith='The').order_by('pk')) == books[:2]
+
+
+@pytest.mark.django_db
+def test_has_lang(books):
+    assert list(Book.objects.filter(title__has_lang='fr')) == [books[2]]
+    assert list(Book.objects.filter(title__has_lang='en').order_by('pk')) == books[:2]
+    assert list(Book.objects.exclude(title__has_lang='en').order_by('pk')) == books[2:]
+
+
+@pytest.mark.django_db
+def test_any(books):
+    assert list(Book.objects.filter(title__any__icontains='the').order_by('pk')) == books[:2]
+    assert list(Book.objects.filter(title__any__icontains='silma')) == [books[2]]
+    assert list(Book.objects.filter(title__any='Der Herr der Ringe')) == [books[0]]
+    assert list(Book.objects.filter(title__any__in=['The Hobbit', 'Le Silmarillion']).order_by('pk')) == books[1:3]
+
+
+@pytest.mark.django_db
+def test_plain_lookups_still_work(books):
+    assert list(Book.objects.filter(title='Beowulf')) == [books[3]]
+    assert Book.objects.filter(title__isnull=True).count() == 0
+
+
+@pytest.mark.django_db
+def test_json_field_lookups():
+    m = Magazine.objects.create(title=LazyI18nString({'de': 'Die Zeit', 'en': 'The Time'}))
+    Magazine.objects.create(title=LazyI18nString({'de': 'Der Spiegel'}))
+    assert list(Magazine.objects.filter(title__de__contains='Zeit')) == [m]
+    assert list(Magazine.objects.filter(title__any__icontains='time')) == [m]
+    assert list(Magazine.objects.filter(title__has_lang='en')) == [m]
@@ -0,0 +1,153 @@
+import pytest
+from django.db import DatabaseError, connection, transaction
+from django.db.models.signals import post_save
+from django.test.utils import CaptureQueriesContext
+
+from i18nfield.strings import LazyI18nString
+
+from .testapp.models import Magazine
+
+
+def updated_columns(queries):
+    updates = [q['sql'] for q in queries if q['sql'].startswith('UPDATE')]
+    assert len(updates) == 1
+    return {column for column in ('title', 'description') if '"{}" ='.format(column) in updates[0]}
+
+
+def test_has_changed():
+    s = LazyI18nString('{"de": "Hallo", "en": "Hello"}')
+    assert not s.has_changed()
+    s.data['de'] = 'Hallo'
+    assert not s.has_changed()
+    s.data['de'] = 'Servus'
+    assert s.has_changed()
+    s = LazyI18nString({'de': 'Hallo'})
+    assert not s.has_changed()
+    s.data['de'] = 'Hallo'
+    assert s.has_changed()
+
+
+@pytest.mark.django_db
+def test_save_unchanged():
+    m = Magazine.objects.create(title=LazyI18nString({'de': 'Die Zeit'}), description=LazyI18nString({'de': 'Wöchentlich'}))
+    m = Magazine.objects.get(pk=m.pk)
+    assert m.get_i18n_update_fields() is None
+    assert str(m.title) == 'Die Zeit'
+    received = []
+    post_save.connect(lambda sender, update_fields, **kwargs: received.append(update_fields), sender=Magazine, weak=False,
+                      dispatch_uid='test_save_unchanged')
+    try:
+        with CaptureQueriesContext(connection) as ctx:
+            m.save()
+    finally:
+        post_save.disconnect(sender=Magazine, dispatch_uid='test_save_unchanged')
+    assert updated_columns(ctx.captured_queries) == {'title', 'description'}
+    assert received == [None]
+
+    Magazine.objects.filter(pk=m.pk).delete()
+    m.save()
+    assert Magazine.objects.get(pk=m.pk).title.data == {'de': 'Die Zeit'}
+
+
+@pytest.mark.django_db
+def test_save_changed():
+    m = Magazine.objects.create(title=LazyI18nString({'de': 'Die Zeit'}), description=LazyI18nString({'de': 'Wöchentlich'}))
+    m = Magazine.objects.get(pk=m.pk)
+    m.title.data['en'] = 'The Time'
+    m.description.data['de'] = 'Wöchentlich'
+    assert m.get_i18n_update_fields() == ['title']
+    with CaptureQueriesContext(connection) as ctx:
+        m.save()
+    assert updated_columns(ctx.captured_queries) == {'title'}
+
+    m.description = LazyI18nString({'de': 'Täglich'})
+    with CaptureQueriesContext(connection) as ctx:
+        m.save()
+    assert updated_columns(ctx.captured_queries) == {'description'}
+
+    m.title.data['fr'] = 'Le Temps'
+    with CaptureQueriesContext(connection) as ctx:
+        m.save()
+    assert updated_columns(ctx.captured_queries) == {'title'}
+
+    m = Magazine.objects.get(pk=m.pk)
+    assert m.title.data == {'de': 'Die Zeit', 'en': 'The Time', 'fr': 'Le Temps'}
+    assert m.description.data == {'de': 'Täglich'}
+
+
+@pytest.mark.django_db
+def test_save_created():
+    m = Magazine.objects.create(title=LazyI18nString({'de': 'Die Zeit'}), description=LazyI18nString({'de': 'Wöchentlich'}))
+    m.description = LazyI18nString({'de': 'Täglich'})
+    with CaptureQueriesContext(connection) as ctx:
+        m.save()
+    assert updated_columns(ctx.captured_queries) == {'description'}
+
+
+@pytest.mark.django_db
+def test_save_copy():
+    m = Magazine.objects.create(title=LazyI18nString({'de': 'Die Zeit'}), description=LazyI18nString({'de': 'Wöchentlich'}))
+    m = Magazine.objects.get(pk=m.pk)
+    m.pk = None
+    m.description = LazyI18nString({'de': 'Täglich'})
+    m.save()
+    assert Magazine.objects.count() == 2
+    copied = Magazine.objects.get(pk=m.pk)
+    assert copied.title.data == {'de': 'Die Zeit'}
+    assert copied.description.data == {'de': 'Täglich'}
+
+
+@pytest.mark.django_db
+def test_save_deleted():
+    m = Magazine.objects.create(title=LazyI18nString({'de': 'Die Zeit'}), description=LazyI18nString({'de': 'Wöchentlich'}))
+    m = Magazine.objects.get(pk=m.pk)
+    Magazine.objects.filter(pk=m.pk).delete()
+    m.description = LazyI18nString({'de': 'Täglich'})
+    with pytest.raises(DatabaseError), transaction.atomic():
+        m.save()
+    m.save(force_insert=True)
+    m = Magazine.objects.get(pk=m.pk)
+    assert m.title.data == {'de': 'Die Zeit'}
+    assert m.description.data == {'de': 'Täglich'}
+
+
+@pytest.mark.django_db
+def test_save_explicit_update_fields():
+    m = Magazine.objects.create(title=LazyI18nString({'de': 'Die Zeit'}))
+    m = Magazine.objects.get(pk=m.pk)
+    with CaptureQueriesContext(connection) as ctx:
+        m.save(update_fields=['title', 'description'])
+    assert updated_columns(ctx.captured_queries) == {'title', 'description'}
+
+
+@pytest.mark.django_db
+def test_save_refreshed():
+    m = Magazine.objects.create(title=LazyI18nString({'de': 'Die Zeit'}))
+    m.refresh_from_db()
+    m.description = LazyI18nString({'de': 'Wöchentlich'})
+    assert m.get_i18n_update_fields() == ['description']
+    m = Magazine.objects.get(pk=m.pk)
+    m.title = LazyI18nString({'de': 'Der Spiegel'})
+    m.description = LazyI18nString({'de': 'Wöchentlich'})
+    m.refresh_from_db(fields=['title'])
+    assert m.get_i18n_update_fields() == ['description']
+
+
+@pytest.mark.django_db
+def test_save_localized():
+    m = Magazine.objects.create(title=LazyI18nString({'de': 'Die Zeit', 'en': 'The Time', 'fr': 'Le Temps'}))
+    m = Magazine.objects.localized('fr', fields=['title']).get(pk=m.pk)
+    m.description = LazyI18nString({'fr': 'Hebdomadaire'})
+    m.save()
+    m = Magazine.objects.get(pk=m.pk)
+    assert m.title.data == {'de': 'Die Zeit', 'en': 'The Time', 'fr': 'Le Temps'}
+    assert m.description.data == {'fr': 'Hebdomadaire'}
+
+
+@pytest.mark.django_db
+def test_save_localized_changed():
+    m = Magazine.objects.create(title=LazyI18nString({'de': 'Die Zeit', 'en': 'The Time', 'fr': 'Le Temps'}))
+    m = Magazine.objects.localized('fr').get(pk=m.pk)
+    m.title.data['fr'] = 'Le Monde'
+    with pytest.raises(ValueError), transaction.atomic():
+        m.save()
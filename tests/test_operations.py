@@ -0,0 +1,47 @@
+import pytest
+from django.db import connection, migrations, models
+from django.db.migrations.state import ProjectState
+
+from i18nfield.fields import I18nCharField, I18nJSONCharField
+from i18nfield.operations import AlterI18nFieldToJSON
+
+
+@pytest.mark.django_db(transaction=True)
+def test_alter_to_json():
+    create = migrations.CreateModel('Journal', [
+        ('id', models.AutoField(primary_key=True)),
+        ('title', I18nCharField(null=True)),
+    ])
+    alter = AlterI18nFieldToJSON('journal', 'title', I18nJSONCharField(null=True))
+    state = ProjectState()
+    new_state = state.clone()
+    create.state_forwards('testapp', new_state)
+    with connection.schema_editor() as editor:
+        create.database_forwards('testapp', editor, state, new_state)
+
+    Journal = new_state.apps.get_model('testapp', 'Journal')
+    Journal.objects.create(title='{"de": "Hallo", "en": "Hello"}')
+    Journal.objects.create(title='Plain')
+    Journal.objects.create(title='')
+    Journal.objects.create(title=None)
+
+    json_state = new_state.clone()
+    alter.state_forwards('testapp', json_state)
+    try:
+        with connection.schema_editor() as editor:
+            alter.database_forwards('testapp', editor, new_state, json_state)
+        Journal = json_state.apps.get_model('testapp', 'Journal')
+        values = [j.title for j in Journal.objects.order_by('pk')]
+        assert values[0].data == {'de': 'Hallo', 'en': 'Hello'}
+        assert values[1].data == 'Plain'
+        assert values[2].data == ''
+        assert values[3].data is None
+        assert list(Journal.objects.filter(title__de='Hallo').values_list('pk', flat=True)) == [1]
+
+        with connection.schema_editor() as editor:
+            alter.database_backwards('testapp', editor, json_state, new_state)
+        Journal = new_state.apps.get_model('testapp', 'Journal')
+        assert [j.title.localize('de') for j in Journal.objects.order_by('pk')] == ['Hallo', 'Plain', '', '']
+    finally:
+        with connection.schema_editor() as editor:
+            create.database_backwards('testapp', editor, new_state, state)
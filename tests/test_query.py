@@ -0,0 +1,159 @@
+import pytest
+from django.db import transaction
+from django.test import override_settings
+
+from i18nfield.expressions import I18nKey
+from i18nfield.query import I18nUpdate
+from i18nfield.strings import LazyI18nString, PartialI18nString
+
+from .testapp.models import Author, Book, Magazine
+
+
+@pytest.fixture
+def books():
+    a = Author.objects.create(name='Tolkien')
+    return [
+        Book.objects.create(author=a, title=LazyI18nString({'de': 'Der Hobbit', 'en': 'The Hobbit', 'fr': 'Le Hobbit'}),
+                            abstract=LazyI18nString({'en': 'A hobbit goes on an adventure'})),
+        Book.objects.create(author=a, title=LazyI18nString({'fr': 'Le Silmarillion'}), abstract='Plain'),
+        Book.objects.create(author=a, title=LazyI18nString({}), abstract=''),
+    ]
+
+
+@pytest.mark.django_db
+def test_localized(books):
+    qs = list(Book.objects.localized('de').order_by('pk'))
+    assert isinstance(qs[0].title, PartialI18nString)
+    assert qs[0].title.data == {'de': 'Der Hobbit', 'en': 'The Hobbit'}
+    assert qs[0].abstract.data == {'en': 'A hobbit goes on an adventure'}
+    assert qs[1].title.data == {'de': 'Le Silmarillion'}
+    assert qs[1].abstract.data == {'de': 'Plain'}
+    assert qs[2].title.data == {}
+    for obj, full in zip(qs, Book.objects.order_by('pk')):
+        assert obj.title.localize('de') == full.title.localize('de')
+        assert obj.abstract.localize('de') == full.abstract.localize('de')
+        assert obj.author_id == full.author_id
+
+
+@pytest.mark.django_db
+def test_localized_fields(books):
+    with override_settings(LANGUAGES=[('de', 'German'), ('de-informal', 'German (informal)'), ('en', 'English')]):
+        b = Book.objects.localized('de-informal', fields=['title']).get(pk=books[0].pk)
+    assert b.title.data == {'de': 'Der Hobbit', 'en': 'The Hobbit'}
+    assert isinstance(b.abstract, LazyI18nString)
+    assert not isinstance(b.abstract, PartialI18nString)
+
+
+@pytest.mark.django_db
+def test_localized_json():
+    Magazine.objects.create(title=LazyI18nString({'de': 'Die Zeit', 'en': 'The Time', 'fr': 'Le Temps'}))
+    m = Magazine.objects.localized('fr').get()
+    assert m.title.data == {'fr': 'Le Temps', 'en': 'The Time'}
+    assert m.description.data == {}
+
+
+@pytest.mark.django_db
+def test_localized_not_saved(books):
+    b = Book.objects.localized('de').get(pk=books[0].pk)
+    with pytest.raises(ValueError), transaction.atomic():
+        b.save()
+    b.save(update_fields=['author'])
+    b.refresh_from_db(fields=['title'])
+    b.save(update_fields=['title'])
+    assert Book.objects.get(pk=books[0].pk).title.localize('fr') == 'Le Hobbit'
+
+
+@pytest.mark.django_db
+def test_iter_localized(books):
+    result = list(Book.objects.order_by('pk').iter_localized('de', chunk_size=2))
+    assert [obj.pk for obj, strings in result] == [b.pk for b in books]
+    assert [strings for obj, strings in result] == [
+        {'title': 'Der Hobbit', 'abstract': 'A hobbit goes on an adventure'},
+        {'title': 'Le Silmarillion', 'abstract': 'Plain'},
+        {'title': '', 'abstract': ''},
+    ]
+    result = list(Book.objects.localized('fr').order_by('pk').iter_localized('fr', fields=['title']))
+    assert [strings for obj, strings in result] == [{'title': 'Le Hobbit'}, {'title': 'Le Silmarillion'}, {'title': ''}]
+
+
+@pytest.mark.django_db
+def test_values_localized(books):
+    rows = list(Book.objects.order_by('pk').values_localized('de', 'pk', 'title', 'abstract', chunk_size=2))
+    assert rows == [
+        {'pk': books[0].pk, 'title': 'Der Hobbit', 'abstract': 'A hobbit goes on an adventure'},
+        {'pk': books[1].pk, 'title': 'Le Silmarillion', 'abstract': 'Plain'},
+        {'pk': books[2].pk, 'title': '', 'abstract': ''},
+    ]
+    rows = list(Book.objects.filter(pk=books[0].pk).values_localized('fr'))
+    assert rows == [{'title': 'Le Hobbit', 'abstract': 'A hobbit goes on an adventure'}]
+
+
+@pytest.mark.django_db
+def test_values_localized_json():
+    Magazine.objects.create(title=LazyI18nString({'de': 'Die Zeit', 'en': 'The Time'}))
+    assert list(Magazine.objects.values_localized('fr', 'title', 'description')) == [
+        {'title': 'The Time', 'description': ''}
+    ]
+
+
+@pytest.mark.django_db
+def test_update_set_language(books):
+    assert I18nUpdate.set_language(Book.objects.all(), 'title', 'de', 'Neu') == 3
+    titles = [b.title.data for b in Book.objects.order_by('pk')]
+    assert titles == [
+        {'de': 'Neu', 'en': 'The Hobbit', 'fr': 'Le Hobbit'},
+        {'de': 'Neu', 'fr': 'Le Silmarillion'},
+        {'de': 'Neu'},
+    ]
+    I18nUpdate.set_language(Book.objects.filter(pk=books[1].pk), 'abstract', 'en', 'Elves')
+    assert Book.objects.get(pk=books[1].pk).abstract.data == {'en': 'Elves'}
+    I18nUpdate.set_language(Book.objects.all(), 'title', 'de', '')
+    assert Book.objects.get(pk=books[2].pk).title.data == {}
+
+
+@pytest.mark.django_db
+def test_update_set_language_expression(books):
+    Book.objects.filter(pk=books[0].pk).update(abstract='{"en": ""}')
+    I18nUpdate.set_language(Book.objects.all(), 'title', 'en', I18nKey('abstract', 'en'))
+    titles = [b.title.data for b in Book.objects.order_by('pk')]
+    assert titles == [
+        {'de': 'Der Hobbit', 'fr': 'Le Hobbit'},
+        {'fr': 'Le Silmarillion'},
+        {},
+    ]
+    I18nUpdate.set_language(Book.objects.all(), 'title', 'de-informal', I18nKey('title', 'fr'))
+    assert Book.objects.get(pk=books[1].pk).title.data == {'de-informal': 'Le Silmarillion', 'fr': 'Le Silmarillion'}
+
+
+@pytest.mark.django_db
+def test_update_remove_language(books):
+    assert I18nUpdate.remove_language(Book.objects.all(), 'title', 'fr') == 3
+    titles = [b.title.data for b in Book.objects.order_by('pk')]
+    assert titles == [{'de': 'Der Hobbit', 'en': 'The Hobbit'}, {}, {}]
+
+
+@pytest.mark.django_db
+def test_update_remove_language_keeps_plain_values(books):
+    Book.objects.filter(pk=books[2].pk).update(title='Plain legacy')
+    I18nUpdate.remove_language(Book.objects.all(), 'title', 'fr')
+    I18nUpdate.set_language(Book.objects.all(), 'abstract', 'de', I18nKey('title', 'fr'))
+    b = Book.objects.get(pk=books[2].pk)
+    assert b.title.data == 'Plain legacy'
+    assert b.title.localize('de') == 'Plain legacy'
+    assert Book.objects.get(pk=books[1].pk).abstract.data == 'Plain'
+    m = Magazine.objects.create(title='Plain')
+    I18nUpdate.remove_language(Magazine.objects.all(), 'title', 'en')
+    m.refresh_from_db()
+    assert m.title.localize('de') == 'Plain'
+
+
+@pytest.mark.django_db
+def test_update_json():
+    m = Magazine.objects.create(title=LazyI18nString({'de': 'Die Zeit', 'en': 'The Time'}))
+    Magazine.objects.create(title='Plain')
+    I18nUpdate.set_language(Magazine.objects.all(), 'title', 'fr', 'Le Temps')
+    I18nUpdate.remove_language(Magazine.objects.all(), 'title', 'en')
+    assert [m.title.data for m in Magazine.objects.order_by('pk')] == [{'de': 'Die Zeit', 'fr': 'Le Temps'}, {'fr': 'Le Temps'}]
+    assert Magazine.objects.filter(title__fr='Le Temps').count() == 2
+    m.refresh_from_db()
+    assert m.title.localize('fr') == 'Le Temps'
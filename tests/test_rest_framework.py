@@ -1,10 +1,15 @@
 import json
 import pytest
 from rest_framework.exceptions import ValidationError
+from rest_framework.renderers import JSONRenderer
 
-from i18nfield.rest_framework import I18nField, I18nRestFrameworkEncoder
+from i18nfield.rest_framework import (
+    I18nAwareModelSerializer, I18nField, I18nRestFrameworkEncoder,
+)
 from i18nfield.strings import LazyI18nString
 
+from .testapp.models import Author, Book, Magazine
+
 
 @pytest.mark.parametrize('string', (
     LazyI18nString('foo'),
@@ -43,3 +48,48 @@ def test_i18n_field_internalisation(value, expected):
             I18nField().to_internal_value(value)
     else:
         assert I18nField().to_internal_value(value) == expected
+
+
+def test_encode_json_raw_passthrough():
+    raw = '{"en": "foo",  "de": "Foo"}'
+    assert json.dumps([LazyI18nString(raw)], cls=I18nRestFrameworkEncoder) == '[%s]' % raw
+
+
+class MagazineSerializer(I18nAwareModelSerializer):
+    class Meta:
+        model = Magazine
+        fields = ['title', 'description']
+
+
+@pytest.mark.django_db
+def test_serializer_json_fields():
+    m = Magazine.objects.create(title=LazyI18nString({'de': 'Die Zeit'}))
+    serializer = MagazineSerializer(Magazine.objects.get(pk=m.pk))
+    assert isinstance(serializer.fields['title'], I18nField)
+    assert json.loads(JSONRenderer().render(serializer.data)) == {'title': {'de': 'Die Zeit'}, 'description': None}
+    assert not MagazineSerializer(data={'title': {'zz': 'Nope'}}).is_valid()
+
+
+class BookSerializer(I18nAwareModelSerializer):
+    class Meta:
+        model = Book
+        fields = ['title', 'abstract']
+
+
+@pytest.mark.django_db
+def test_serializer_does_not_modify():
+    a = Author.objects.create(name='Tolkien')
+    Book.objects.create(author=a, title=LazyI18nString({'de': 'Der Hobbit', 'en': 'The Hobbit'}), abstract='Plain')
+    b = Book.objects.get()
+    assert BookSerializer(b).data == {'title': {'de': 'Der Hobbit', 'en': 'The Hobbit'}, 'abstract': {'en': 'Plain'}}
+    assert b.title.raw is not None
+    assert not b.title.has_changed()
+
+    s = LazyI18nString('{"de": "Hallo"}', shared=True)
+    rep = I18nField().to_representation(s)
+    rep['de'] = 'Changed'
+    assert s.localize('de') == 'Hallo'
+    assert LazyI18nString('{"de": "Hallo"}', shared=True).localize('de') == 'Hallo'
+    rep = BookSerializer(b).data
+    rep['title']['de'] = 'Changed'
+    assert b.title.localize('de') == 'Der Hobbit'
@@ -1,7 +1,13 @@
+import copy
+import json
+import pickle
+import sys
+from django.test import override_settings
 from django.utils import translation
-from django.utils.translation import gettext_noop
+from django.utils.translation import gettext, gettext_noop
+from unittest import mock
 
-from i18nfield.strings import LazyI18nString
+from i18nfield.strings import LazyI18nString, _fallback_chain, localize_many
 
 
 def test_explicit_translation():
@@ -24,6 +30,15 @@ def test_create_from_string():
     assert s.data == 'Invalid JSON'
 
 
+def test_parse_deferred():
+    with mock.patch('i18nfield.strings.json.loads', wraps=json.loads) as loads:
+        s = LazyI18nString('{"en": "Hello"}')
+        assert not loads.called
+        assert str(s) == 'Hello'
+        assert s.data == {"en": "Hello"}
+        assert loads.call_count == 1
+
+
 def test_similar_translations():
     data = {
         'en': 'You',
@@ -146,3 +161,204 @@ def test_map():
     assert str(s) == 'Hello'
     translation.activate('de')
     assert str(s) == 'Hallo'
+
+
+def test_fallback_order():
+    s = LazyI18nString({'fr': 'Bonjour', 'de-informal': 'Hallo du', 'de-formal': 'Guten Tag', 'en': 'Hello'})
+    assert s.localize('de-formal') == 'Guten Tag'
+    assert s.localize('de') == 'Hallo du'
+    assert s.localize('de-AT') == 'Hallo du'
+    assert s.localize('it') == 'Hello'
+    s = LazyI18nString({'fr': 'Bonjour', 'de': ''})
+    assert s.localize('de') == 'Bonjour'
+    s = LazyI18nString({'fr': '', 'de': ''})
+    assert s.localize('de') == ''
+
+
+def test_fallback_chain_cached():
+    _fallback_chain.cache_clear()
+    s1 = LazyI18nString({'en': 'Hello', 'de': 'Hallo'})
+    s2 = LazyI18nString({'en': 'Good bye', 'de': 'Tschüss'})
+    assert s1.localize('de-AT') == 'Hallo'
+    assert s2.localize('de-AT') == 'Tschüss'
+    info = _fallback_chain.cache_info()
+    assert info.misses == 1
+    assert info.hits == 1
+    assert _fallback_chain('de-AT', ('en', 'de'), 'en') == ('de', 'en')
+
+
+def test_compact():
+    s = LazyI18nString('{"en": "Hello", "de": "Hallo"}')
+    assert not hasattr(s, '__dict__')
+    key = [k for k in s.data if k == 'de'][0]
+    assert key is sys.intern('de')
+
+
+def test_pickle():
+    s = LazyI18nString('{"en": "Hello", "de": "Hallo"}')
+    s2 = pickle.loads(pickle.dumps(s))
+    assert s2 == s
+    assert s2.raw == s.raw
+    assert copy.deepcopy(s) == s
+
+
+def test_unpickle_legacy():
+    # Pickled by versions of LazyI18nString without __slots__
+    s = pickle.loads(
+        b'\x80\x02ci18nfield.strings\nLazyI18nString\nq\x00)\x81q\x01}q\x02X\x04\x00\x00\x00dataq\x03}q\x04(X\x02\x00'
+        b'\x00\x00deq\x05X\x05\x00\x00\x00Halloq\x06X\x02\x00\x00\x00enq\x07X\x05\x00\x00\x00Helloq\x08usb.'
+    )
+    assert s.data == {'de': 'Hallo', 'en': 'Hello'}
+    assert s.localize('de') == 'Hallo'
+    assert s.raw is None
+    s = pickle.loads(b'\x80\x02ci18nfield.strings\nLazyI18nString\nq\x00)\x81q\x01}q\x02X\x04\x00\x00\x00dataq\x03X\x05\x00\x00\x00Plainq\x04sb.')
+    assert s.localize('de') == 'Plain'
+    s = pickle.loads(
+        b'\x80\x02ci18nfield.strings\nLazyI18nString\nq\x00)\x81q\x01}q\x02X\x04\x00\x00\x00dataq\x03c__builtin__\ngetattr\n'
+        b'q\x04h\x00X\x10\x00\x00\x00LazyGettextProxyq\x05\x86q\x06Rq\x07)\x81q\x08}q\tX\x0b\x00\x00\x00lazygettextq\n'
+        b'X\x05\x00\x00\x00Helloq\x0bsbsb.'
+    )
+    assert s.localize('de') == 'Hello'
+
+
+def test_memoize():
+    s = LazyI18nString({'de': 'Hallo', 'en': 'Hello'}, memoize=True)
+    with mock.patch('i18nfield.strings._fallback_chain', wraps=_fallback_chain) as chain:
+        assert s.localize('de') == 'Hallo'
+        assert s.localize('de') == 'Hallo'
+        translation.activate('de')
+        assert str(s) == 'Hallo'
+        assert chain.call_count == 1
+
+        s.map(lambda v: v.upper())
+        assert s.localize('de') == 'HALLO'
+        s.data = {'de': 'Tschüss'}
+        assert s.localize('de') == 'Tschüss'
+        s.data['de'] = 'Ciao'
+        assert s.localize('de') == 'Ciao'
+        assert chain.call_count == 4
+
+
+def test_memoize_copy():
+    a = LazyI18nString({'de': 'A'}, memoize=True)
+    assert a.localize('de') == 'A'
+    b = copy.copy(a)
+    b.data = {'de': 'B'}
+    assert b.localize('de') == 'B'
+    assert a.localize('de') == 'A'
+    c = pickle.loads(pickle.dumps(a))
+    assert c._localized == {}
+    assert c.localize('de') == 'A'
+    assert copy.copy(LazyI18nString('x'))._localized is None
+
+
+def test_not_memoized():
+    s = LazyI18nString({'de': 'Hallo', 'en': 'Hello'})
+    with mock.patch('i18nfield.strings._fallback_chain', wraps=_fallback_chain) as chain:
+        assert s.localize('de') == 'Hallo'
+        assert s.localize('de') == 'Hallo'
+        assert chain.call_count == 2
+
+
+def test_from_gettext_cached():
+    lstr = LazyI18nString.from_gettext(gettext_noop('Welcome'))
+    with mock.patch('i18nfield.strings.gettext', wraps=gettext) as gt:
+        assert lstr.data['de'] == 'Welcome'
+        assert lstr.data['de'] == 'Welcome'
+        assert gt.call_count == 1
+        with override_settings(LOCALE_PATHS=[]):
+            assert lstr.data['de'] == 'Welcome'
+        assert gt.call_count == 2
+
+
+def test_from_gettext_to_dict():
+    lstr = LazyI18nString.from_gettext(gettext_noop('Welcome'))
+    assert lstr.data.to_dict() == {'de': 'Welcome', 'en': 'Welcome', 'fr': 'Welcome'}
+    assert lstr.data.to_dict(['de']) == {'de': 'Welcome'}
+
+
+def test_localize_many():
+    values = [
+        LazyI18nString({'de': 'Hallo', 'en': 'Hello'}),
+        LazyI18nString({'en': 'Bye', 'de': ''}),
+        LazyI18nString('{"fr": "Salut"}'),
+        LazyI18nString('Plain'),
+        LazyI18nString({'de': 'Hallo'}, memoize=True),
+        LazyI18nString({}),
+        None,
+    ]
+    assert localize_many(values, 'de') == ['Hallo', 'Bye', 'Salut', 'Plain', 'Hallo', '', '']
+    assert localize_many(values, 'de') == [v.localize('de') if v is not None else '' for v in values]
+
+
+def test_configured_fallbacks():
+    s = LazyI18nString({'de': 'Hallo', 'de-AT': 'Servus', 'en': 'Hello', 'fr': 'Bonjour'})
+    with override_settings(I18NFIELD_FALLBACKS={'de-CH': ['fr', 'de'], 'it': []}):
+        assert s.localize('de-CH') == 'Bonjour'
+        assert s.localize('de-LU') == 'Hallo'
+        assert s.localize('it') == 'Hallo'
+        assert localize_many([s], 'de-CH') == ['Bonjour']
+        assert LazyI18nString({'en': 'Hello', 'de': 'Hallo'}).localize('de-CH') == 'Hallo'
+        assert LazyI18nString({'en': 'Hello'}).localize('de-CH') == 'Hello'
+    assert s.localize('de-CH') == 'Hallo'
+
+
+def test_hash():
+    s1 = LazyI18nString('{"en": "Hello", "de": "Hallo"}')
+    s2 = LazyI18nString({'de': 'Hallo', 'en': 'Hello'})
+    s3 = LazyI18nString({'de': 'Hallo'})
+    assert hash(s1) == hash(s2)
+    assert len({s1, s2, s3}) == 2
+    assert hash(LazyI18nString('Plain')) == hash(LazyI18nString('Plain'))
+    hash(LazyI18nString(None))
+    hash(LazyI18nString.from_gettext(gettext_noop('Welcome')))
+
+    s3.data['en'] = 'Hello'
+    assert hash(s3) == hash(s1)
+    s3.map(lambda v: v.upper())
+    assert s3 != s1
+
+
+def test_digest():
+    s1 = LazyI18nString('{"en": "Hello", "de": "Hallo"}')
+    s2 = LazyI18nString({'de': 'Hallo', 'en': 'Hello'})
+    assert s1.digest == s2.digest
+    assert s1.digest == '9c9eb517f4b3bfcd68a30ee0eec0aaecc09f8b1df7db158c1c9bd2b0808ae9d8'
+    assert LazyI18nString('Plain').digest != LazyI18nString('{"en": "Plain"}').digest
+    assert LazyI18nString(None).digest != LazyI18nString('').digest
+    assert LazyI18nString.from_gettext(gettext_noop('Welcome')).digest == \
+        LazyI18nString({'de': 'Welcome', 'en': 'Welcome', 'fr': 'Welcome'}).digest
+
+    digest = s2.digest
+    s2.data = {'de': 'Tschüss'}
+    assert s2.digest != digest
+    s2.data['de'] = 'Hallo'
+    s2.data['en'] = 'Hello'
+    assert s2.digest == digest
+
+
+def test_pickle_hash():
+    s = LazyI18nString({'de': 'Hallo'})
+    hash(s)
+    assert pickle.loads(pickle.dumps(s))._hash is None
+    assert pickle.loads(pickle.dumps(s)) == s
+
+
+def test_shared():
+    raw = '{"de": "Hallo", "en": "Hello"}'
+    s1 = LazyI18nString(raw, shared=True)
+    s2 = LazyI18nString(raw, shared=True)
+    assert s1.localize('de') == 'Hallo'
+    assert s1._get_data() is s2._get_data()
+    assert s1.raw == raw
+
+    s1.data['de'] = 'Servus'
+    assert s1.localize('de') == 'Servus'
+    assert s2.localize('de') == 'Hallo'
+    assert s2.raw == raw
+    assert LazyI18nString(raw, shared=True).localize('de') == 'Hallo'
+
+    s2.map(lambda v: v.upper())
+    assert s2.localize('de') == 'HALLO'
+    assert LazyI18nString(raw, shared=True).localize('de') == 'Hallo'
+    assert LazyI18nString(raw)._get_data() is not LazyI18nString(raw, shared=True)._get_data()
@@ -29,3 +29,13 @@ def test_encode_json():
         "books": [],
         'num': '0.00'
     }
+
+
+def test_encode_json_raw_passthrough():
+    raw = '{"de": "Hallo",  "en": "Hello"}'
+    s = LazyI18nString(raw)
+    encoded = json.dumps({'salutation': s, 'plain': LazyI18nString('{no json}')}, cls=I18nJSONEncoder)
+    assert encoded == '{"salutation": %s, "plain": "{no json}"}' % raw
+
+    s.map(lambda v: v.upper())
+    assert json.loads(json.dumps(s, cls=I18nJSONEncoder)) == {"de": "HALLO", "en": "HELLO"}
@@ -0,0 +1,23 @@
+# Generated by Django 4.0.10 on 2026-10-18 05:05
+
+from django.db import migrations, models
+
+import i18nfield.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('testapp', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Magazine',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', i18nfield.fields.I18nJSONCharField(verbose_name='Magazine title')),
+                ('description', i18nfield.fields.I18nJSONTextField(blank=True, null=True, verbose_name='Description')),
+            ],
+        ),
+    ]
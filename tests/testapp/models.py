@@ -1,7 +1,11 @@
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
-from i18nfield.fields import I18nCharField, I18nTextField
+from i18nfield.fields import (
+    I18nCharField, I18nJSONCharField, I18nJSONTextField, I18nTextField,
+)
+from i18nfield.models import I18nModelMixin
+from i18nfield.query import I18nManager
 
 
 class Author(models.Model):
@@ -16,5 +20,17 @@ class Book(models.Model):
     abstract = I18nTextField(verbose_name='Abstract')
     author = models.ForeignKey('Author', verbose_name='Author', on_delete=models.CASCADE)
 
+    objects = I18nManager()
+
+    def __str__(self):
+        return str(self.title)
+
+
+class Magazine(I18nModelMixin, models.Model):
+    title = I18nJSONCharField(verbose_name='Magazine title')
+    description = I18nJSONTextField(verbose_name='Description', null=True, blank=True)
+
+    objects = I18nManager()
+
     def __str__(self):
         return str(self.title)